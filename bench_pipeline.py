@@ -0,0 +1,313 @@
+# bench_pipeline.py
+# python bench_pipeline.py [--phases early mid late] [--recording recordings/session.jsonl.gz] [--ticks 60]
+#                          [--save-baseline] [--baseline bench_baseline.json] [--tolerance 0.25]
+# Drives game_data_monitor.process_tick with synthetic (or recorded) allgamedata payloads and reports
+# p50/p99 latency and peak allocation per stage. Exits 1 if a stage regressed against the baseline.
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+
+import log_utils
+
+log_utils.log_sink.root = tempfile.mkdtemp(prefix="bench_logs_")  # Keep the journal/event logs out of logs/
+
+import game_data_monitor
+from game_data_monitor import process_tick, generate_game_recap, set_triggers, pending_events
+from shared_state import previous_state, player_ratings, event_store
+from game_snapshot import GameSnapshot
+from utils import game_utils
+from triggers.game_triggers import (KillCountTrigger, DeathTrigger, FirstBloodTrigger, DragonKillTrigger, GameEndTrigger,
+                                    AceTrigger, AtakhanKillTrigger, HeraldKillTrigger, BaronTrigger)
+
+BASELINE_FILE = "bench_baseline.json"
+PHASES = {"early": 5, "mid": 20, "late": 45}  # Game minute each synthetic session starts at
+TICK_SECONDS = 5
+WARMUP_TICKS = 2  # The first tick after attaching ingests the whole event history; not measured
+STAGES = ("parse", "aggregates", "power_scores", "overlay_push", "snapshot", "triggers", "callback", "total")
+MIN_REGRESSION_MS = 0.05  # Ignore slowdowns smaller than this (timer noise on sub-stages)
+MIN_REGRESSION_KB = 16
+
+POSITIONS = ("TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY")
+CHAMPIONS = ("Darius", "LeeSin", "Ahri", "Jinx", "Thresh", "Camille", "Viego", "Syndra", "Kaisa", "Nautilus")
+STARTERS = (1055, 1056, 1054, 3340, 3363)
+BOOTS = (3006, 3047, 3111, 3020, 3158)
+LEGENDARIES = (3031, 3071, 3053, 3026, 3036, 3072, 3065, 3003, 3033, 3046, 3074, 3142, 3157, 3089, 3115, 6672)
+
+def bench_triggers():
+    """Same lineup zorobot.py registers."""
+    return [KillCountTrigger(), DeathTrigger(), FirstBloodTrigger(), DragonKillTrigger(), GameEndTrigger(),
+            AceTrigger(), AtakhanKillTrigger(), HeraldKillTrigger(), BaronTrigger()]
+
+# ---- SYNTHETIC PAYLOADS ----
+
+def _timeline(rng, players, end_seconds):
+    """Seeded event history up to end_seconds: kills (with multikills), turrets, dragons, grubs, herald, baron, inhibs."""
+    events = [{"EventName": "GameStart", "EventTime": 0.0}, {"EventName": "MinionsSpawning", "EventTime": 65.0}]
+    t = 90.0
+    while t < end_seconds:
+        t += rng.expovariate(1 / 25)
+        killer, victim = rng.sample(players, 2)
+        if killer["team"] == victim["team"]:
+            continue  # ~1.3 kills/minute remain
+        allies = [p["summonerName"] for p in players if p["team"] == killer["team"] and p is not killer]
+        events.append({"EventName": "ChampionKill", "EventTime": t, "KillerName": killer["summonerName"],
+                       "VictimName": victim["summonerName"], "Assisters": rng.sample(allies, rng.randint(0, 3))})
+        if rng.random() < 0.08:
+            events.append({"EventName": "Multikill", "EventTime": t + 2, "KillerName": killer["summonerName"], "KillStreak": 2})
+    objectives = [(300 * i + 30, "DragonKill") for i in range(1, 12)]
+    objectives += [(480, "HordeKill"), (540, "HordeKill"), (900, "HeraldKill"), (1500, "BaronKill"), (2100, "BaronKill")]
+    objectives += [(600 + 150 * i, "TurretKilled") for i in range(12)] + [(1800, "InhibKilled"), (2400, "InhibKilled")]
+    for when, name in objectives:
+        killer = rng.choice(players)
+        event = {"EventName": name, "EventTime": float(when), "KillerName": killer["summonerName"]}
+        if name == "DragonKill":
+            event.update({"DragonType": rng.choice(("Fire", "Earth", "Water", "Air", "Hextech", "Chemtech")), "Stolen": "False"})
+        elif name in ("BaronKill", "HeraldKill"):
+            event["Stolen"] = "False"
+        elif name == "TurretKilled":
+            event["TurretKilled"] = f"Turret_T{'1' if killer['team'] == 'CHAOS' else '2'}_L_0{when // 150 % 3 + 1}_A"
+        events.append(event)
+    events.sort(key=lambda e: e["EventTime"])
+    for event_id, event in enumerate(events):
+        event["EventID"] = event_id
+    return events
+
+def _items(rng, minutes):
+    items = [rng.choice(STARTERS)] if minutes < 12 else []
+    items.append(rng.choice(BOOTS))
+    items += rng.sample(LEGENDARIES, min(int(minutes / 7), 5))
+    return [{"itemID": item_id, "displayName": str(item_id), "count": 1, "slot": slot,
+             "price": game_utils.ITEM_PRICES.get(item_id, 0)}
+            for slot, item_id in enumerate(items)]
+
+def synthetic_session(start_minute, ticks, seed=7):
+    """allgamedata payloads, TICK_SECONDS apart, starting at start_minute. Scores follow the event history."""
+    game_utils.ensure_item_prices_loaded()
+    rng = random.Random(seed)
+    players = [
+        {"summonerName": f"Player{i}", "riotId": f"Player{i}#EUW", "riotIdGameName": f"Player{i}",
+         "championName": CHAMPIONS[i], "team": "ORDER" if i < 5 else "CHAOS", "position": POSITIONS[i % 5]}
+        for i in range(10)
+    ]
+    end_seconds = start_minute * 60 + ticks * TICK_SECONDS
+    timeline = _timeline(rng, players, end_seconds)
+    payloads = []
+    for tick in range(ticks):
+        game_time = start_minute * 60 + tick * TICK_SECONDS
+        minutes = game_time / 60
+        events = [e for e in timeline if e["EventTime"] <= game_time]
+        kills = defaultdict(int)
+        deaths = defaultdict(int)
+        assists = defaultdict(int)
+        for event in events:
+            if event["EventName"] == "ChampionKill":
+                kills[event["KillerName"]] += 1
+                deaths[event["VictimName"]] += 1
+                for name in event["Assisters"]:
+                    assists[name] += 1
+        item_rng = random.Random(seed * 1000 + int(minutes))
+        all_players = [
+            {**p, "level": min(18, 1 + int(minutes / 2)), "isDead": False,
+             "items": _items(item_rng, minutes),
+             "scores": {"kills": kills[p["summonerName"]], "deaths": deaths[p["summonerName"]],
+                        "assists": assists[p["summonerName"]],
+                        "creepScore": int(minutes * (1 if p["position"] == "UTILITY" else 7)),
+                        "wardScore": round(minutes * 0.8, 1)}}
+            for p in players
+        ]
+        payloads.append({
+            "activePlayer": {"riotId": players[0]["riotId"], "summonerName": players[0]["summonerName"],
+                             "currentGold": 350 + (tick * 37) % 900,
+                             "championStats": {"currentHealth": 900 + (tick * 53) % 800, "maxHealth": 1900}},
+            "allPlayers": all_players,
+            "events": {"Events": events},
+            "gameData": {"gameMode": "CLASSIC", "gameTime": float(game_time), "gameVersion": "15.7.684.1234"},
+        })
+    return payloads
+
+def recorded_session(path):
+    from live_replay import load_session
+    return [frame["data"] for frame in load_session(path) if frame.get("status", 200) == 200]
+
+# ---- RUNNER ----
+
+class StageProbe:
+    """game_data_monitor.tick_probe: records ms (or peak KB allocated, when tracing) since the previous stage."""
+    def __init__(self, trace_memory):
+        self.trace_memory = trace_memory
+        self.samples = defaultdict(list)
+        self.tick_start = self.mark = 0.0
+        self.base = self.tick_base = self.tick_peak = 0
+
+    def start(self):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            self.base = self.tick_base = tracemalloc.get_traced_memory()[0]
+            self.tick_peak = 0
+        self.tick_start = self.mark = time.perf_counter()
+
+    def __call__(self, stage):
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            self.samples[stage].append((peak - self.base) / 1024)
+            self.tick_peak = max(self.tick_peak, peak - self.tick_base)
+            tracemalloc.reset_peak()
+            self.base = current
+        else:
+            now = time.perf_counter()
+            self.samples[stage].append((now - self.mark) * 1000)
+        self.mark = time.perf_counter()
+
+    def finish(self):
+        if self.trace_memory:
+            self.samples["total"].append(self.tick_peak / 1024)
+        else:
+            self.samples["total"].append((time.perf_counter() - self.tick_start) * 1000)
+
+def bench_callback(data, your_player_data, current_data, merged_results):
+    """The CPU part of zorobot.handle_game_data: building the recap text. The LLM/TTS calls are not benchmarked."""
+    generate_game_recap(data, your_player_data, data.get("activePlayer", {}),
+                        previous_state.get("last_recap_snapshot"), current_data["dragon_kills"])
+
+def reset_game():
+    previous_state.clear()
+    event_store.reset()
+    pending_events.clear()
+    player_ratings.clear()
+    set_triggers(bench_triggers())
+
+def seed_state(payload):
+    """Mark the game as already initialized, so the game-start path (memory write, game counter) is skipped."""
+    you = next(p for p in payload["allPlayers"] if p.get("riotId") == payload["activePlayer"].get("riotId"))
+    scores = you.get("scores", {})
+    snapshot = GameSnapshot(
+        kills=scores.get("kills", 0), deaths=scores.get("deaths", 0), assists=scores.get("assists", 0),
+        cs=scores.get("creepScore", 0), hp=payload["activePlayer"]["championStats"]["currentHealth"],
+        gold=payload["activePlayer"].get("currentGold", 0), item_gold=0, timestamp=time.time(),
+        total_kills=sum(p["scores"]["kills"] for p in payload["allPlayers"]),
+        your_team=you.get("team"), your_name=you.get("summonerName"),
+        last_game_time=payload["gameData"]["gameTime"], items=you.get("items", []),
+    )
+    previous_state.update({
+        "snapshot": snapshot, "your_team": snapshot.your_team, "your_name": snapshot.your_name,
+        "last_game_time": snapshot.last_game_time, "initialized": True, "game_ended": False,
+    })
+
+async def run_phase(payloads, trace_memory):
+    probe = StageProbe(trace_memory)
+    bodies = [json.dumps(payload).encode("utf-8") for payload in payloads]
+    reset_game()
+    seed_state(payloads[0])
+    game_data_monitor.tick_probe = probe
+    try:
+        for tick, body in enumerate(bodies):
+            probe.start()
+            data = json.loads(body)
+            probe("parse")
+            await process_tick(data, bench_callback)
+            probe.finish()
+            if tick < WARMUP_TICKS:
+                for samples in probe.samples.values():
+                    samples.clear()
+    finally:
+        game_data_monitor.tick_probe = None
+    return probe.samples, sum(len(b) for b in bodies) / len(bodies) / 1024
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+async def run(sessions):
+    results = {}
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        for name, payloads in sessions.items():
+            with contextlib.redirect_stdout(devnull):
+                timings, payload_kb = await run_phase(payloads, trace_memory=False)
+                tracemalloc.start()
+                try:
+                    allocations, _ = await run_phase(payloads, trace_memory=True)
+                finally:
+                    tracemalloc.stop()
+            results[name] = {
+                "ticks": len(timings["total"]),
+                "payload_kb": round(payload_kb, 1),
+                "events": len(payloads[-1].get("events", {}).get("Events", [])),
+                "stages": {
+                    stage: {
+                        "p50_ms": round(percentile(timings[stage], 50), 3),
+                        "p99_ms": round(percentile(timings[stage], 99), 3),
+                        "peak_kb": round(percentile(allocations[stage], 50), 1),
+                    }
+                    for stage in STAGES if timings[stage]
+                },
+            }
+    return results
+
+def print_results(results):
+    for name, result in results.items():
+        print(f"\n📊 {name}: {result['ticks']} ticks | {result['events']} events | {result['payload_kb']} KB payload")
+        print(f"   {'stage':<14}{'p50 ms':>10}{'p99 ms':>10}{'alloc KB':>10}")
+        for stage, stats in result["stages"].items():
+            print(f"   {stage:<14}{stats['p50_ms']:>10.3f}{stats['p99_ms']:>10.3f}{stats['peak_kb']:>10.1f}")
+
+def compare(results, baseline, tolerance):
+    """Regression messages for every stage slower/heavier than baseline × (1 + tolerance)."""
+    regressions = []
+    for name, result in results.items():
+        base_stages = baseline.get(name, {}).get("stages", {})
+        for stage, stats in result["stages"].items():
+            base = base_stages.get(stage)
+            if not base:
+                continue
+            for key, floor in (("p50_ms", MIN_REGRESSION_MS), ("p99_ms", MIN_REGRESSION_MS), ("peak_kb", MIN_REGRESSION_KB)):
+                limit = base[key] * (1 + tolerance)
+                if stats[key] > limit and stats[key] - base[key] > floor:
+                    regressions.append(f"{name}/{stage} {key}: {stats[key]} > {base[key]} (+{tolerance:.0%} allowed)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the per-tick game pipeline.")
+    parser.add_argument("--phases", nargs="+", choices=sorted(PHASES), default=list(PHASES), help="Synthetic sessions to run")
+    parser.add_argument("--recording", help="Benchmark a LIVE_CLIENT_RECORD session instead of synthetic payloads")
+    parser.add_argument("--ticks", type=int, default=60, help="Ticks per synthetic session")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before failing (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    if args.recording:
+        sessions = {"recording": recorded_session(args.recording)}
+    else:
+        sessions = {name: synthetic_session(PHASES[name], args.ticks + WARMUP_TICKS) for name in args.phases}
+    results = asyncio.run(run(sessions))
+    print_results(results)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Baseline saved to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"\nℹ️ No baseline at {args.baseline} — run with --save-baseline to create one.")
+        return
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    if regressions:
+        print("\n❌ Regressions against baseline:")
+        for line in regressions:
+            print(f"   {line}")
+        sys.exit(1)
+    print("\n✅ No regressions against baseline.")
+
+if __name__ == "__main__":
+    main()
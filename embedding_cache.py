@@ -0,0 +1,110 @@
+# embedding_cache.py
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+
+EMBEDDING_CACHE_DIR = "./embedding_cache"
+MEMORY_CACHE_SIZE = 2048  # Embeddings kept in the in-memory LRU tier
+
+class EmbeddingCache:
+    """
+    Two-tier cache for text embeddings, keyed by sha256(model + text).
+    Hot vectors live in an in-memory LRU; every vector is also appended to a
+    compact float32 file on disk (memory-mapped for reads) so it survives restarts.
+    Disk layout per model: <model>.f32 (rows of float32) + <model>.keys (one hash per row).
+    """
+    def __init__(self, model, cache_dir=EMBEDDING_CACHE_DIR, max_memory_items=MEMORY_CACHE_SIZE):
+        self.model = model
+        self.max_memory_items = max_memory_items
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.vectors_path = os.path.join(cache_dir, f"{model}.f32")
+        self.keys_path = os.path.join(cache_dir, f"{model}.keys")
+        self.dim = None
+        self.rows = {}  # key → row in vectors file
+        self._mmap = None
+        self._load_index()
+
+    def _key(self, text):
+        return hashlib.sha256(f"{self.model}\n{text}".encode("utf-8")).hexdigest()
+
+    def _load_index(self):
+        if not os.path.exists(self.keys_path) or not os.path.exists(self.vectors_path):
+            return
+        with open(self.keys_path, "r", encoding="utf-8") as f:
+            keys = [line.strip() for line in f if line.strip()]
+        vector_bytes = os.path.getsize(self.vectors_path)
+        if not keys or vector_bytes % (4 * len(keys)):
+            print(f"⚠️ [EmbeddingCache] {self.vectors_path} doesn't match its key index — starting fresh.")
+            for path in (self.keys_path, self.vectors_path):
+                os.remove(path)
+            return
+        self.dim = vector_bytes // (4 * len(keys))
+        self.rows = {key: row for row, key in enumerate(keys)}
+        print(f"🧮 [EmbeddingCache] Loaded {len(keys)} cached embeddings ({self.model}, dim {self.dim})")
+
+    def _disk_vectors(self):
+        if self._mmap is None and self.rows:
+            self._mmap = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(len(self.rows), self.dim))
+        return self._mmap
+
+    def _remember(self, key, vector):
+        self.memory[key] = vector
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory_items:
+            self.memory.popitem(last=False)
+
+    def get(self, text):
+        """Cached embedding for `text` as a list of floats, or None."""
+        key = self._key(text)
+        with self._lock:
+            vector = self.memory.get(key)
+            if vector is not None:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return vector
+            row = self.rows.get(key)
+            if row is not None:
+                vector = self._disk_vectors()[row].tolist()
+                self._remember(key, vector)
+                self.hits += 1
+                self.disk_hits += 1
+                return vector
+            self.misses += 1
+            return None
+
+    def put(self, text, vector):
+        key = self._key(text)
+        array = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            self._remember(key, list(vector))
+            if key in self.rows:
+                return
+            if self.dim is None:
+                self.dim = array.shape[0]
+            elif array.shape[0] != self.dim:
+                print(f"⚠️ [EmbeddingCache] Skipping disk write: dim {array.shape[0]} != {self.dim}")
+                return
+            with open(self.vectors_path, "ab") as f:
+                f.write(array.tobytes())
+            with open(self.keys_path, "a", encoding="utf-8") as f:
+                f.write(key + "\n")
+            self.rows[key] = len(self.rows)
+            self._mmap = None  # Remap lazily to include the new row
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "memory_items": len(self.memory),
+            "disk_items": len(self.rows)
+        }
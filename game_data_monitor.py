@@ -1,22 +1,29 @@
 # game_data_monitor.py
 import asyncio
 import os
-import requests
 import time
 import json
-from utils.game_utils import estimate_team_gold,  power_score, infer_missing_roles
+from utils.game_utils import estimate_team_gold,  power_scores, infer_missing_roles, use_game_version
+from utils.roster import RosterIndex, normalize_role
 from triggers.game_triggers import MultikillEventTrigger,FeatsOfStrengthTrigger, StreakTrigger
-from shared_state import previous_state, player_ratings, inhib_respawn_timer, baron_expire, elder_expire,seen_inhib_events,tracker
-import copy
+from shared_state import previous_state, player_ratings, inhib_respawn_timer, baron_expire, elder_expire, event_store, tracker
+from game_snapshot import GameSnapshot, freeze_objectives
 from overlay_push import push_power_scores,push_game_number
 from game_tracker import GameTracker
 from memory_manager import add_to_memory
+from live_client import PollScheduler, create_poller
+from journal import journal
 
 
-POLL_INTERVAL = 5
-LIVE_CLIENT_URL = "https://127.0.0.1:2999/liveclientdata/allgamedata"
+POWER_SCORE_VERBOSE = os.getenv("POWER_SCORE_VERBOSE", "false").lower() == "true"
+GAME_LOOP_DEBUG = os.getenv("GAME_LOOP_DEBUG", "false").lower() == "true"  # Print every tick's snapshot
+FIGHT_HP_DROP = 0.08  # Losing this share of max HP between polls counts as fighting
+live_client = create_poller()
+poll_scheduler = PollScheduler()
 triggers = []
+pending_events = []  # New events ingested but not yet handed to the triggers
 callback_from_zorobot = None
+tick_probe = None  # Optional callable(stage), called as each process_tick stage finishes (bench_pipeline.py)
 feats_trigger = FeatsOfStrengthTrigger()
 streak_trigger = StreakTrigger()
 
@@ -25,34 +32,42 @@ def set_triggers(trigger_list):
     triggers = trigger_list + [feats_trigger, streak_trigger]  # they are declared globally above
     print(f"✅ Triggers loaded: {[t.__class__.__name__ for t in triggers]}")
 
-def get_previous_state():
-    return copy.deepcopy(previous_state)
-
-def get_team_of_killer(event, all_players):
-    killer = event.get("KillerName", "")
-    player = next((p for p in all_players if p.get("summonerName") == killer), None)
-    return player.get("team") if player else None
+def dispatch_triggers(new_events, current_data, previous_data):
+    """
+    Run every trigger through the cheapest hook it subscribes to:
+    new events filtered by EventName, a stat-delta check, or a plain per-poll check.
+    """
+    results = []
+    for trigger in triggers:
+        if trigger.event_names:
+            events = [e for e in new_events if e.get("EventName") in trigger.event_names]
+            if not events:
+                continue
+            print(f"[DEBUG] Checking trigger: {trigger.__class__.__name__} ({len(events)} new event(s))")
+            result = trigger.check_events(events, current_data, previous_data)
+        elif trigger.stat_keys:
+            deltas = {
+                key: current_data.get(key, 0) - previous_data.get(key, 0)
+                for key in trigger.stat_keys
+                if current_data.get(key, 0) != previous_data.get(key, 0)
+            }
+            if not deltas:
+                continue
+            print(f"[DEBUG] Checking trigger: {trigger.__class__.__name__} (deltas: {deltas})")
+            result = trigger.check_stats(deltas, current_data, previous_data)
+        else:
+            result = trigger.check(current_data, previous_data)
+        if result:
+            results.append(result)
+    return results
 
-def normalize_role(position):
-    if not position:
-        return "unknown"
-    mapping = {
-        "TOP": "top",
-        "JUNGLE": "jungle",
-        "MIDDLE": "middle",
-        "BOTTOM": "bottom",
-        "UTILITY": "utility",
-        "SUPPORT": "utility"
-    }
-    return mapping.get(position.upper(), "unknown") if position else "unknown"
+def _probe(stage):
+    if tick_probe is not None:
+        tick_probe(stage)
 
-def find_enemy_laner(player, all_players):
-    role = player.get("position", "")
-    team = player.get("team", "")
-    for enemy in all_players:
-        if enemy.get("team") != team and enemy.get("position", "") == role:
-            return enemy
-    return None  # fallback if no match found
+def get_previous_state():
+    """Shallow copy of the monitor state. The snapshots in it are immutable, so nothing deeper is copied."""
+    return dict(previous_state)
 
 def generate_game_recap(all_data, you, active_player, last_snapshot=None, dragon_kills=None):
     your_name = you.get("summonerName", "You")
@@ -117,249 +132,224 @@ def generate_game_recap(all_data, you, active_player, last_snapshot=None, dragon
     )
     return "Since the last update:\n" + "\n".join(recap_lines) + "\n" + summary
 
+async def process_tick(data, callback):
+    """One pass of the game pipeline over a parsed allgamedata document."""
+    active_player = data.get("activePlayer", {})
+    # 🛑 INSERT THIS BLOCK HERE
+    if not active_player or not active_player.get("championStats"):
+        if previous_state.get("game_ended"):
+            print("✅ Clean disconnect after GameEnd. Final cleanup.")
+            previous_state.clear()
+            event_store.reset()
+            pending_events.clear()
+            player_ratings.clear()
+            previous_state["game_ended"] = True  # So AskAI still sees "game is over"
+            for trigger in triggers:
+                if hasattr(trigger, "reset"):
+                    trigger.reset()
+        elif previous_state.get("initialized"):
+            print("⚠️ Unexpected disconnect while game was active. Holding state.")
+        poll_scheduler.update("loading")
+        return
+    riot_id = active_player.get("riotId", None)
+    all_players = data.get("allPlayers", [])
+    roster = RosterIndex(all_players)  # ✅ One name → player index per snapshot, shared with all triggers
+    your_player_data = roster.player(riot_id)
+    if not your_player_data:
+        poll_scheduler.update("loading")
+        return
+    if not any(isinstance(t, MultikillEventTrigger) for t in triggers):
+        your_name = your_player_data.get("summonerName")
+        triggers.append(MultikillEventTrigger(your_name=your_name))
+        print(f"🆕 Injected MultikillEventTrigger for {your_name}")
+    # Extract data
+    scores = your_player_data.get("scores", {})
+    kills = scores.get("kills", 0)
+    deaths = scores.get("deaths", 0)
+    assists = scores.get("assists", 0)
+    cs = scores.get("creepScore", 0)
+    hp = active_player.get("championStats", {}).get("currentHealth", 0)
+    max_hp = active_player.get("championStats", {}).get("maxHealth", 0)
+    current_gold = active_player.get("currentGold", 0)
+    item_gold = sum(item.get("price", 0) * item.get("count", 1) for item in your_player_data.get("items", []))
+    your_team = your_player_data.get("team", "ORDER")
+    timestamp_now = time.time()
+    game_time_seconds = data.get("gameData", {}).get("gameTime", 0)
+    events = data.get("events", {}).get("Events", [])
+    total_kills = sum(p.get("scores", {}).get("kills", 0) for p in all_players)
+    use_game_version(data.get("gameData", {}).get("gameVersion"))
+    teams_gold = estimate_team_gold(all_players)
+    your_team_gold = teams_gold.get(your_team, 0)
+    enemy_team_gold = sum(v for k, v in teams_gold.items() if k != your_team)
+    gold_diff = your_team_gold - enemy_team_gold
+    # Only events newer than the last EventID seen are ingested
+    ingested = event_store.ingest(events, roster.team_of)
+    pending_events.extend(ingested)
+    # ⏱️ Poll faster while something is happening
+    previous_snapshot = previous_state.get("snapshot") or GameSnapshot()
+    took_damage = max_hp > 0 and previous_snapshot.get("hp", hp) - hp >= max_hp * FIGHT_HP_DROP
+    poll_scheduler.update("post_game" if previous_state.get("game_ended") else "in_game",
+                          active=bool(ingested) or took_damage)
+    if previous_snapshot.get("last_event_id") == event_store.last_event_id:
+        dragon_kills, buff_timers = previous_snapshot.dragon_kills, previous_snapshot.buff_timers  # Unchanged → shared
+    else:
+        dragon_kills, buff_timers = freeze_objectives(event_store.dragon_kills, baron_expire, elder_expire, inhib_respawn_timer)
+    _probe("aggregates")
+    # Inject streaks
+    for player in all_players:
+        summoner_name = player.get("summonerName")
+        player["killStreak"] = streak_trigger.get_player_streak(summoner_name)
+    # 🧠 Collect enhanced data for power_score
+    game_time_minutes = max(game_time_seconds / 60, 1)
+    dragon_soul_team = data.get("events", {}).get("DragonSoulTeam")
+    feats_team = feats_trigger.get_triggered_team()
+    team_data_by_team = {}
+    lane_opponents = []
+    player_team_data_list = []
+    for player in all_players:
+        player_team = player.get("team", "UNKNOWN")
+        if player_team not in team_data_by_team:
+            team_data_by_team[player_team] = {
+                **event_store.team_data(player_team, game_time_seconds),
+                "dragon_soul": dragon_soul_team == player_team,
+                "feats_of_strength": 1 if feats_team == player_team else 0,
+            }
+        player_team_data_list.append(team_data_by_team[player_team])
+        lane_opponents.append(roster.lane_opponent(player))
+    # Whole roster scored in one batched pass (breakdown only printed when POWER_SCORE_VERBOSE=true)
+    scores = power_scores(all_players, lane_opponents, player_team_data_list,
+                          game_time_minutes=game_time_minutes, verbose=POWER_SCORE_VERBOSE)
+    for player, score in zip(all_players, scores):
+        player_ratings[player.get("summonerName", "UNKNOWN")] = score * 5
+    _probe("power_scores")
+    # ✅ Now after the loop: build formatted_players once
+    formatted_players = [
+        {
+            "name": player.get("summonerName", "UNKNOWN"),
+            "score": round(player_ratings.get(player.get("summonerName", ""), 0), 1),
+            "team": player.get("team", "UNKNOWN"),
+            "role": normalize_role(player.get("position", ""))
+        }
+        for player in all_players
+    ]
+    # ✅ And then infer and push
+    formatted_players = infer_missing_roles(formatted_players)
+    order_score = sum(p["score"] for p in formatted_players if p["team"] == "ORDER")
+    chaos_score = sum(p["score"] for p in formatted_players if p["team"] == "CHAOS")
+    previous_state["formatted_players"] = formatted_players
+    previous_state["team_scores"] = {
+        "ORDER": round(order_score, 1),
+        "CHAOS": round(chaos_score, 1)
+    }
+    await push_power_scores({
+        "players": formatted_players,
+        "order_total": round(order_score, 1),
+        "chaos_total": round(chaos_score, 1)
+    })
+    _probe("overlay_push")
+    # Detect game start or reset
+    if game_time_seconds < 10 and previous_state.get("last_game_time", 9999) > 30:
+        print("🔁 New game detected. Resetting state.")
+        previous_state.clear()
+        event_store.reset()
+        pending_events.clear()
+        player_ratings.clear()
+        for trigger in triggers:
+            if hasattr(trigger, "reset"):
+                trigger.reset()
+        return
+    # Build this tick's snapshot
+    snapshot = GameSnapshot(
+        hp=hp,
+        cs=cs,
+        kills=kills,
+        deaths=deaths,
+        assists=assists,
+        gold=current_gold,
+        item_gold=item_gold,
+        timestamp=timestamp_now,
+        total_kills=total_kills,
+        your_team=your_team,
+        your_name=your_player_data.get("summonerName"),  # ✅ This fixes your StreakTrigger!
+        dragon_kills=dragon_kills,
+        last_game_time=game_time_seconds,
+        gold_diff=gold_diff,
+        last_event_id=event_store.last_event_id,
+        buff_timers=buff_timers,
+        allPlayers=all_players,
+        roster=roster,
+        events=data.get("events", {}),
+        items=your_player_data.get("items", []),
+    )
+    # First-time init
+    if not previous_state.get("initialized"):
+        previous_state.update({
+            "snapshot": snapshot,
+            "your_team": your_team,
+            "your_name": snapshot.your_name,
+            "last_game_time": game_time_seconds,
+            "initialized": True,
+            "game_ended": False,  # ✅ Reset here too
+        })
+        # 🧠 Increment game number and log game start
+        tracker.increment_game_number()
+        game_id = tracker.get_game_id()
+        game_number = tracker.get_game_number()
+        stream_date = tracker.get_stream_date()
+        print(f"🆕 Game {game_number} started with ID {game_id}")
+        # 📡 Push game number to overlay
+        await push_game_number(game_number)
+        add_to_memory(
+            content="A new League game has started.",
+            type_="game_event",
+            stream_date=stream_date,
+            game_number=game_number,
+            metadata={"event": "game_start"}
+        )
+        print("📡 Initialized game_data_loop with current stats.")
+        return
+    if GAME_LOOP_DEBUG:
+        print(f"[GameLoop] snapshot: {json.dumps(snapshot.summary(), indent=2, default=dict)}")
+    _probe("snapshot")
+    # Trigger evaluation (only on events that arrived since the last dispatch)
+    new_events = pending_events[:]
+    pending_events.clear()
+    game_id = tracker.get_game_id()
+    for event in new_events:
+        journal("game_event", game_id=game_id, event_name=event.get("EventName"),
+                game_time=event.get("EventTime"), event=event)
+    # Stat deltas are measured against the last dispatched tick, which keeps advancing after GameEnd
+    # (unlike previous_state["snapshot"], frozen at the end-of-game state), so nothing is announced twice
+    trigger_baseline = previous_state.get("trigger_snapshot") or previous_snapshot
+    merged_results = dispatch_triggers(new_events, snapshot, trigger_baseline)
+    previous_state["trigger_snapshot"] = snapshot
+    _probe("triggers")
+    # 🔁 Send results to zorobot
+    result = callback(data, your_player_data, snapshot, merged_results)
+    if asyncio.iscoroutine(result):
+        await result
+    _probe("callback")
+    # Update state
+    if not previous_state.get("game_ended"):
+        previous_state["snapshot"] = snapshot
+        previous_state["last_game_time"] = game_time_seconds
+
 async def monitor_game_data(callback):
     print("🕹️ Game Data Monitor started.")
+    if not callable(callback):
+        print("❌ Invalid callback provided to monitor_game_data.")
+        return
     while True:
         try:
-            response = requests.get(LIVE_CLIENT_URL, timeout=5, verify=False)
-            if response.status_code != 200:
-                await asyncio.sleep(POLL_INTERVAL)
+            data = await live_client.fetch()
+            if data is None:
+                poll_scheduler.update("loading")
+                await asyncio.sleep(live_client.next_delay())
                 continue
-            data = response.json()
-            active_player = data.get("activePlayer", {})
-            # 🛑 INSERT THIS BLOCK HERE
-            if not active_player or not active_player.get("championStats"):
-                if previous_state.get("game_ended"):
-                    print("✅ Clean disconnect after GameEnd. Final cleanup.")
-                    previous_state.clear()
-                    inhib_respawn_timer["ORDER"].clear()
-                    inhib_respawn_timer["CHAOS"].clear()
-                    baron_expire.clear()
-                    elder_expire.clear()
-                    player_ratings.clear()
-                    seen_inhib_events.clear()
-                    previous_state["game_ended"] = True  # So AskAI still sees "game is over"
-                    for trigger in triggers:
-                        if hasattr(trigger, "reset"):
-                            trigger.reset()
-                elif previous_state.get("initialized"):
-                    print("⚠️ Unexpected disconnect while game was active. Holding state.")
-                await asyncio.sleep(POLL_INTERVAL)
-                continue
-            riot_id = active_player.get("riotId", None)
-            all_players = data.get("allPlayers", [])
-            your_player_data = next((p for p in all_players if p.get("riotId") == riot_id), None)
-            if not your_player_data:
-                await asyncio.sleep(POLL_INTERVAL)
-                continue
-            if not any(isinstance(t, MultikillEventTrigger) for t in triggers):
-                your_name = your_player_data.get("summonerName")
-                triggers.append(MultikillEventTrigger(your_name=your_name))
-                print(f"🆕 Injected MultikillEventTrigger for {your_name}")
-            # Extract data
-            scores = your_player_data.get("scores", {})
-            kills = scores.get("kills", 0)
-            deaths = scores.get("deaths", 0)
-            assists = scores.get("assists", 0)
-            cs = scores.get("creepScore", 0)
-            hp = active_player.get("championStats", {}).get("currentHealth", 0)
-            current_gold = active_player.get("currentGold", 0)
-            item_gold = sum(item.get("price", 0) * item.get("count", 1) for item in your_player_data.get("items", []))
-            your_team = your_player_data.get("team", "ORDER")
-            timestamp_now = time.time()
-            game_time_seconds = data.get("gameData", {}).get("gameTime", 0)
-            events = data.get("events", {}).get("Events", [])
-            total_kills = sum(p.get("scores", {}).get("kills", 0) for p in all_players)
-            teams_gold = estimate_team_gold(all_players)
-            your_team_gold = teams_gold.get(your_team, 0)
-            enemy_team_gold = sum(v for k, v in teams_gold.items() if k != your_team)
-            gold_diff = your_team_gold - enemy_team_gold
-            dragon_kills = {"ORDER": 0, "CHAOS": 0}
-            for e in events:
-                if e.get("EventName") == "DragonKill":
-                    killer = e.get("KillerName", "")
-                    killer_player = next((p for p in all_players if p.get("summonerName") == killer), None)
-                    if killer_player:
-                        team = killer_player.get("team", "UNKNOWN")
-                        dragon_kills[team] += 1
-                if e["EventName"] == "InhibKilled":
-                    event_id = f"{e['EventName']}_{e['EventTime']}"  # or use e['EventID'] if it exists
-                    if event_id not in seen_inhib_events:
-                        team = get_team_of_killer(e, all_players)
-                        if team:
-                            respawn_time = e["EventTime"] + 300  # 5 minutes
-                            inhib_respawn_timer[team].append(respawn_time)
-                        seen_inhib_events.add(event_id)
-                if e["EventName"] == "BaronKill":
-                    team = get_team_of_killer(e, all_players)
-                    if team:
-                        baron_expire[team] = e["EventTime"] + 180  # 3 minutes
-                if e["EventName"] == "ElderKill":
-                    team = get_team_of_killer(e, all_players)
-                    if team:
-                        elder_expire[team] = e["EventTime"] + 150  # 2.5 minutes
-            # Inject streaks
-            for player in all_players:
-                summoner_name = player.get("summonerName")
-                player["killStreak"] = streak_trigger.get_player_streak(summoner_name)
-            # 🧠 Collect enhanced data for power_score
-            game_time_minutes = max(game_time_seconds / 60, 1)
-            for player in all_players:
-                player_team = player.get("team", "UNKNOWN")
-                player_team_data = {
-                    "dragons": dragon_kills.get(player_team, 0),
-                    "dragon_soul": data.get("events", {}).get("DragonSoulTeam") == player_team,
-                    "elder_dragon": elder_expire.get(player_team, 0) > game_time_seconds,
-                    "baron_buff": baron_expire.get(player_team, 0) > game_time_seconds,
-                    "heralds": sum(1 for e in events if e["EventName"] == "HeraldKill" and get_team_of_killer(e, all_players) == player_team),
-                    "atakan_buff": any(e["EventName"] == "AtakhanKill" and get_team_of_killer(e, all_players) == player_team for e in events),
-                    "atakan_temp": sum(1 for e in events if e["EventName"] == "AtakhanKill" and get_team_of_killer(e, all_players) == player_team),
-                    "void_grubs": sum(1 for e in events if e.get("EventName") == "HordeKill" and get_team_of_killer(e, all_players) == player_team),
-                    "feats_of_strength": 1 if feats_trigger.get_triggered_team() == player_team else 0,
-                    "towers": {
-                        "tier1": sum(1 for e in events if e["EventName"] == "TurretKilled" and "T1" in e["TurretKilled"] and get_team_of_killer(e, all_players) == player_team ),
-                        "tier2": sum(1 for e in events if e["EventName"] == "TurretKilled" and "T2" in e["TurretKilled"] and get_team_of_killer(e, all_players) == player_team),
-                        "tier3": sum(1 for e in events if e["EventName"] == "TurretKilled" and "T3" in e["TurretKilled"] and get_team_of_killer(e, all_players) == player_team),
-                    },
-                    "inhibitors_down": sum(1 for t in inhib_respawn_timer[player_team] if t > game_time_seconds)
-                }
-                lane_opponent = find_enemy_laner(player, all_players)  # You'll define this
-                score = power_score(player, enemy_laner=lane_opponent, team_data=player_team_data, game_time_minutes=game_time_minutes, verbose=True) * 5
-                player_ratings[player.get("summonerName", "UNKNOWN")] = score
-            # ✅ Now after the loop: build formatted_players once
-            formatted_players = [
-                {
-                    "name": player.get("summonerName", "UNKNOWN"),
-                    "score": round(player_ratings.get(player.get("summonerName", ""), 0), 1),
-                    "team": player.get("team", "UNKNOWN"),
-                    "role": normalize_role(player.get("position", ""))
-                }
-                for player in all_players
-            ]
-            # ✅ And then infer and push
-            formatted_players = infer_missing_roles(formatted_players)
-            order_score = sum(p["score"] for p in formatted_players if p["team"] == "ORDER")
-            chaos_score = sum(p["score"] for p in formatted_players if p["team"] == "CHAOS")
-            previous_state["formatted_players"] = formatted_players
-            previous_state["team_scores"] = {
-                "ORDER": round(order_score, 1),
-                "CHAOS": round(chaos_score, 1)
-            }
-            await push_power_scores({
-                "players": formatted_players,
-                "order_total": round(order_score, 1),
-                "chaos_total": round(chaos_score, 1)
-            })
-            # Detect game start or reset
-            if game_time_seconds < 10 and previous_state.get("last_game_time", 9999) > 30:
-                print("🔁 New game detected. Resetting state.")
-                previous_state.clear()
-                inhib_respawn_timer["ORDER"].clear()
-                inhib_respawn_timer["CHAOS"].clear()
-                baron_expire.clear()
-                elder_expire.clear()
-                seen_inhib_events.clear()
-                player_ratings.clear()
-                for trigger in triggers:
-                    if hasattr(trigger, "reset"):
-                        trigger.reset()
-                await asyncio.sleep(POLL_INTERVAL)
-                continue
-            # First-time init
-            if not previous_state.get("initialized"):
-                previous_state.update({
-                    "kills": kills,
-                    "deaths": deaths,
-                    "assists": assists,
-                    "cs": cs,
-                    "last_hp": hp,
-                    "gold": current_gold,
-                    "item_gold": item_gold,
-                    "last_damage_timestamp": timestamp_now,
-                    "last_trigger_time": timestamp_now,
-                    "last_cs_milestone": (cs // 70) * 70,
-                    "total_kills": total_kills,
-                    "your_team": your_team,
-                    "your_name": your_player_data.get("summonerName"),  # ✅ This fixes your StreakTrigger!
-                    "dragon_kills": dragon_kills,
-                    "last_game_time": game_time_seconds,
-                    "initialized": True,
-                    "game_ended": False,  # ✅ Reset here too
-                    "buff_timers": {
-                        "baron_expire": baron_expire.copy(),
-                        "elder_expire": elder_expire.copy(),
-                        "inhib_respawn_timer": {k: list(v) for k, v in inhib_respawn_timer.items()},
-                    }
-                })
-                # 🧠 Increment game number and log game start
-                tracker.increment_game_number()
-                game_id = tracker.get_game_id()
-                game_number = tracker.get_game_number()
-                stream_date = tracker.get_stream_date()
-                print(f"🆕 Game {game_number} started with ID {game_id}")
-                # 📡 Push game number to overlay
-                await push_game_number(game_number)
-                add_to_memory(
-                    content="A new League game has started.",
-                    type_="game_event",
-                    stream_date=stream_date,
-                    game_number=game_number,
-                    metadata={"event": "game_start"}
-                )
-                print("📡 Initialized game_data_loop with current stats.")
-                await asyncio.sleep(POLL_INTERVAL)
-                continue
-            # Build current_data snapshot
-            current_data = {
-                "hp": hp,
-                "cs": cs,
-                "kills": kills,
-                "deaths": deaths,
-                "last_hp": hp,
-                "gold": current_gold,
-                "item_gold": item_gold,
-                "assists": assists,
-                "timestamp": timestamp_now,
-                "total_kills": total_kills,
-                "your_team": your_team,
-                "your_name": your_player_data.get("summonerName"),  # ✅ This fixes your StreakTrigger!
-                "dragon_kills": dragon_kills,
-                "last_game_time": game_time_seconds,
-                "gold_diff": gold_diff,
-                "allPlayers": all_players,
-                "buff_timers": {
-                    "baron_expire": baron_expire.copy(),
-                    "elder_expire": elder_expire.copy(),
-                    "inhib_respawn_timer": {k: list(v) for k, v in inhib_respawn_timer.items()},
-                },                
-                "events": data.get("events", {})
-            }
-            # Copy current_data just for debugging purposes
-            debug_data = current_data.copy()
-            debug_data.pop("allPlayers", None)
-            debug_data.pop("events", None)
-            print(f"[GameLoop] current_data (clean): {json.dumps(debug_data, indent=2)}")
-            # Trigger evaluation
-            merged_results = []
-            for trigger in triggers:
-                print(f"[DEBUG] Checking trigger: {trigger.__class__.__name__}")
-                result = trigger.check(current_data, previous_state)
-                if result:
-                    merged_results.append(result)
-            # 🔁 Send results to zorobot
-            if not callable(callback):
-                print("❌ Invalid callback provided to monitor_game_data.")
-                return
-            result = callback(data, your_player_data, current_data, merged_results)
-            if asyncio.iscoroutine(result):
-                await result
-            # Update state
-            if not previous_state.get("game_ended"):
-                previous_state.update(current_data)
-                previous_state["last_game_time"] = game_time_seconds
+            await process_tick(data, callback)
         except Exception as e:
             print(f"[GameMonitor Error]: {e}")
-        await asyncio.sleep(POLL_INTERVAL)
+        await asyncio.sleep(poll_scheduler.next_delay())
 
 def set_callback(func):
     global callback_from_zorobot
@@ -372,6 +362,9 @@ async def game_data_loop():
     cb = get_callback()
     if cb:
         print(f"[DEBUG] Game loop callback is: {cb}, type: {type(cb)}")
-        await monitor_game_data(cb)
+        try:
+            await monitor_game_data(cb)
+        finally:
+            await live_client.close()
     else:
         print("⚠️ No callback set for game_data_loop.")
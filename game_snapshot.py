@@ -0,0 +1,66 @@
+# game_snapshot.py
+from types import MappingProxyType
+
+HEAVY_FIELDS = ("allPlayers", "roster", "events", "items")  # Left out of summary()
+_MISSING = object()
+
+class GameSnapshot:
+    """
+    Immutable view of one monitor tick (your stats, team aggregates, objective timers).
+    Reads work like the old current_data dict (snapshot.get("kills", 0), snapshot["dragon_kills"]),
+    so triggers, the recap builder and AskAI readers don't care which they get.
+    Nothing is copied: allPlayers/events/roster point at the tick's payload, and unchanged
+    objective state (dragon_kills, buff_timers) is the very same read-only mapping as the
+    previous tick's.
+    """
+    __slots__ = ("hp", "cs", "kills", "deaths", "assists", "gold", "item_gold", "timestamp", "total_kills",
+                 "your_team", "your_name", "dragon_kills", "last_game_time", "gold_diff", "last_event_id",
+                 "buff_timers", "allPlayers", "roster", "events", "items")
+
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            if name not in self.__slots__:
+                raise TypeError(f"GameSnapshot has no field '{name}'")
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("GameSnapshot is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("GameSnapshot is immutable")
+
+    @property
+    def last_hp(self):
+        return self.get("hp", 0)
+
+    def get(self, key, default=None):
+        if key != "last_hp" and key not in self.__slots__:
+            return default
+        return getattr(self, key, default)
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return key in self.__slots__ and hasattr(self, key)
+
+    def summary(self):
+        """Scalar fields (plus dragon/buff state) for logging. json.dumps it with default=dict."""
+        return {name: getattr(self, name) for name in self.__slots__
+                if name not in HEAVY_FIELDS and hasattr(self, name)}
+
+    def __repr__(self):
+        return f"GameSnapshot({self.summary()!r})"
+
+def freeze_objectives(dragon_kills, baron_expire, elder_expire, inhib_respawn_timer):
+    """Read-only copies of the event store's objective state, taken only when it changed."""
+    dragons = MappingProxyType(dict(dragon_kills))
+    buff_timers = MappingProxyType({
+        "baron_expire": MappingProxyType(dict(baron_expire)),
+        "elder_expire": MappingProxyType(dict(elder_expire)),
+        "inhib_respawn_timer": MappingProxyType({team: tuple(timers) for team, timers in inhib_respawn_timer.items()}),
+    })
+    return dragons, buff_timers
@@ -0,0 +1,131 @@
+# journal.py
+# python journal.py [--date YYYY-MM-DD] [--game game_20250602_1] [--user name] [--kind askai] [--contains text] [--stats]
+import argparse
+import json
+import os
+from datetime import datetime, timezone
+from log_utils import LOG_ROOT, log_line
+
+JOURNAL_FILE = "journal.jsonl"
+INDEX_FILE = "journal.idx.json"
+INDEX_FIELDS = ("kind", "game_id", "user")
+
+def journal(kind, game_id=None, user=None, **fields):
+    """
+    Append one typed record to logs/<date>/journal.jsonl (through the background log sink).
+    kinds in use: game_event, openai_usage, askai, tts_state.
+    """
+    record = {"ts": datetime.now(timezone.utc).isoformat(), "kind": kind}
+    if game_id:
+        record["game_id"] = game_id
+    if user:
+        record["user"] = user
+    record.update(fields)
+    log_line(JOURNAL_FILE, json.dumps(record, ensure_ascii=False, default=str), stamped=False)
+
+# ---- OFFLINE INDEX / QUERY ----
+
+def _day_dir(date_str):
+    return os.path.join(LOG_ROOT, date_str)
+
+def load_index(date_str):
+    """
+    Per-day index: for each of kind/game_id/user, value → byte offsets of matching records.
+    It's built lazily and extended incrementally: only bytes past `indexed_bytes` are scanned.
+    """
+    journal_path = os.path.join(_day_dir(date_str), JOURNAL_FILE)
+    index_path = os.path.join(_day_dir(date_str), INDEX_FILE)
+    index = {"indexed_bytes": 0, "records": 0, **{field: {} for field in INDEX_FIELDS}}
+    if os.path.exists(index_path):
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            print(f"⚠️ Rebuilding unreadable index {index_path}")
+    if not os.path.exists(journal_path):
+        return index
+    size = os.path.getsize(journal_path)
+    if size < index["indexed_bytes"]:
+        return load_index_from_scratch(date_str)
+    if size == index["indexed_bytes"]:
+        return index
+    with open(journal_path, "rb") as f:
+        f.seek(index["indexed_bytes"])
+        offset = index["indexed_bytes"]
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # Half-written tail; pick it up next time
+            try:
+                record = json.loads(line)
+            except ValueError:
+                offset += len(line)
+                continue
+            for field in INDEX_FIELDS:
+                value = record.get(field)
+                if value is not None:
+                    index[field].setdefault(str(value), []).append(offset)
+            index["records"] += 1
+            offset += len(line)
+    index["indexed_bytes"] = offset
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, separators=(",", ":"))
+    return index
+
+def load_index_from_scratch(date_str):
+    index_path = os.path.join(_day_dir(date_str), INDEX_FILE)
+    if os.path.exists(index_path):
+        os.remove(index_path)
+    return load_index(date_str)
+
+def query_journal(date_str, kind=None, game_id=None, user=None, contains=None):
+    """Yield records of one day matching every given filter, in write order."""
+    index = load_index(date_str)
+    offsets = None
+    for field, value in (("kind", kind), ("game_id", game_id), ("user", user)):
+        if value is None:
+            continue
+        matches = set(index[field].get(value, []))
+        offsets = matches if offsets is None else offsets & matches
+    journal_path = os.path.join(_day_dir(date_str), JOURNAL_FILE)
+    if not os.path.exists(journal_path):
+        return
+    with open(journal_path, "rb") as f:
+        if offsets is None:
+            lines = (line for line in f if line.endswith(b"\n"))
+        else:
+            def _seek_lines():
+                for offset in sorted(offsets):
+                    f.seek(offset)
+                    yield f.readline()
+            lines = _seek_lines()
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if contains and contains.lower() not in json.dumps(record, ensure_ascii=False).lower():
+                continue
+            yield record
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the ZoroTheCaster event journal.")
+    parser.add_argument("--date", default=datetime.now(timezone.utc).strftime("%Y-%m-%d"), help="UTC day (YYYY-MM-DD)")
+    parser.add_argument("--kind", help="Record type, e.g. game_event, openai_usage, askai, tts_state")
+    parser.add_argument("--game", help="game_id, e.g. game_20250602_1")
+    parser.add_argument("--user")
+    parser.add_argument("--contains", help="Case-insensitive substring match on the whole record")
+    parser.add_argument("--stats", action="store_true", help="Show record counts per kind/game/user instead")
+    args = parser.parse_args()
+    if args.stats:
+        index = load_index(args.date)
+        print(f"📒 {args.date}: {index['records']} records")
+        for field in INDEX_FIELDS:
+            print(f"  {field}:")
+            for value, offsets in sorted(index[field].items(), key=lambda item: -len(item[1])):
+                print(f"    {value}: {len(offsets)}")
+        return
+    for record in query_journal(args.date, kind=args.kind, game_id=args.game, user=args.user, contains=args.contains):
+        print(json.dumps(record, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+# live_client.py
+import asyncio
+import gzip
+import json
+import os
+import time
+import aiohttp
+
+# Point at a replay server (live_replay.py) with e.g. LIVE_CLIENT_URL=http://127.0.0.1:2999/liveclientdata/allgamedata
+LIVE_CLIENT_URL = os.getenv("LIVE_CLIENT_URL", "https://127.0.0.1:2999/liveclientdata/allgamedata")
+# Set to a path (e.g. recordings/session.jsonl.gz) to capture every poll for later replay
+LIVE_CLIENT_RECORD = os.getenv("LIVE_CLIENT_RECORD")
+# "endpoints": small per-tick requests (EndpointPoller) | "allgamedata": the full document every tick
+LIVE_CLIENT_FETCH = os.getenv("LIVE_CLIENT_FETCH", "endpoints").lower()
+REQUEST_TIMEOUT = 2.5  # Hard deadline per poll (connect + read)
+MAX_BACKOFF = 30  # Longest wait between polls while the client is down
+# Adaptive poll intervals (seconds)
+FAST_INTERVAL = 1.0  # Fights / fresh events
+NORMAL_INTERVAL = 2.5  # Shortly after activity
+IDLE_INTERVAL = 5.0  # Nothing happening (farming, fountain, dead)
+SLOW_INTERVAL = 10.0  # Loading screen, post-game; also the backoff base while the client is unreachable
+PLAYERLIST_INTERVAL = 5.0  # EndpointPoller: refresh /playerlist at most this often (sooner after a kill)
+HOT_SECONDS = 10  # Stay at FAST_INTERVAL this long after the last activity
+IDLE_AFTER = 30  # Drop to IDLE_INTERVAL after this long without activity
+
+class SessionRecorder:
+    """
+    Appends every poll to a gzip JSONL session file: {"t": seconds since start, "status": code, "data": {...}}.
+    status 0 means the client was unreachable. live_replay.py serves these files back.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.start = time.monotonic()
+        self.frames = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = gzip.open(path, "at", encoding="utf-8")
+        print(f"⏺️ [LiveClient] Recording session to {path}")
+
+    def record(self, status, data=None):
+        frame = {"t": round(time.monotonic() - self.start, 3), "status": status}
+        if data is not None:
+            frame["data"] = data
+        self.file.write(json.dumps(frame, separators=(",", ":")) + "\n")
+        self.frames += 1
+        if self.frames % 20 == 0:
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
+        print(f"⏹️ [LiveClient] Recorded {self.frames} frame(s) to {self.path}")
+
+class PollScheduler:
+    """
+    Picks the delay before the next poll from what the last tick saw.
+    The monitor calls update(phase, active) once per tick: phase is "in_game", "loading"
+    or "post_game"; active means a fight was going on (new events, damage taken).
+    In game it polls every FAST_INTERVAL for HOT_SECONDS after activity, then
+    NORMAL_INTERVAL, then IDLE_INTERVAL once quiet for IDLE_AFTER. Loading and
+    post-game screens poll every SLOW_INTERVAL. Unreachable clients are handled by
+    LiveClientPoller's backoff.
+    """
+    def __init__(self, fast=FAST_INTERVAL, normal=NORMAL_INTERVAL, idle=IDLE_INTERVAL, slow=SLOW_INTERVAL,
+                 hot_seconds=HOT_SECONDS, idle_after=IDLE_AFTER):
+        self.fast = fast
+        self.normal = normal
+        self.idle = idle
+        self.slow = slow
+        self.hot_seconds = hot_seconds
+        self.idle_after = idle_after
+        self.phase = "loading"
+        self.last_activity = None
+        self.last_delay = None
+
+    def update(self, phase, active=False):
+        self.phase = phase
+        if active:
+            self.last_activity = time.monotonic()
+
+    def next_delay(self):
+        if self.phase != "in_game":
+            delay = self.slow
+        else:
+            quiet = time.monotonic() - self.last_activity if self.last_activity is not None else self.idle_after
+            if quiet < self.hot_seconds:
+                delay = self.fast
+            elif quiet < self.idle_after:
+                delay = self.normal
+            else:
+                delay = self.idle
+        if delay != self.last_delay:
+            print(f"⏱️ [LiveClient] Polling every {delay:g}s ({self.phase})")
+            self.last_delay = delay
+        return delay
+
+class LiveClientPoller:
+    """
+    Async poller for the Riot Live Client API.
+    Keeps one keep-alive session open so polls never block the event loop,
+    and backs off exponentially while the League client is unreachable.
+    """
+    def __init__(self, url=LIVE_CLIENT_URL, timeout=REQUEST_TIMEOUT, poll_interval=SLOW_INTERVAL, max_backoff=MAX_BACKOFF,
+                 record_path=LIVE_CLIENT_RECORD):
+        self.url = url
+        self.recorder = SessionRecorder(record_path) if record_path else None
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self.session = None
+        self.failures = 0
+        self.last_latency_ms = None
+        self.last_status = None
+
+    def _get_session(self):
+        if self.session is None or self.session.closed:
+            # Live Client uses a self-signed cert on localhost → no TLS verification
+            connector = aiohttp.TCPConnector(ssl=False, limit=4, keepalive_timeout=60)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self.session
+
+    async def fetch(self):
+        """Return the parsed allgamedata document, or None if the client is down / not in game."""
+        session = self._get_session()
+        start = time.perf_counter()
+        try:
+            async with session.get(self.url) as response:
+                self.last_status = response.status
+                if response.status != 200:
+                    self._record_failure(f"HTTP {response.status}", start)
+                    await self._record(response.status)
+                    return None
+                body = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            self.last_status = None
+            self._record_failure(type(e).__name__, start)
+            await self._record(0)
+            return None
+        try:
+            data = json.loads(body)
+        except ValueError as e:
+            self._record_failure(f"Bad JSON: {e}", start)
+            return None
+        self.last_latency_ms = (time.perf_counter() - start) * 1000
+        if self.failures:
+            print(f"✅ [LiveClient] Reconnected after {self.failures} failed poll(s).")
+        self.failures = 0
+        print(f"[LiveClient] Poll OK in {self.last_latency_ms:.1f} ms ({len(body) / 1024:.1f} KB)")
+        await self._record(200, data)
+        return data
+
+    async def _record(self, status, data=None):
+        if self.recorder:
+            await asyncio.to_thread(self.recorder.record, status, data)
+
+    def _record_failure(self, reason, start):
+        self.failures += 1
+        self.last_latency_ms = (time.perf_counter() - start) * 1000
+        print(f"[LiveClient] Poll failed ({reason}) in {self.last_latency_ms:.1f} ms | "
+              f"retry in {self.next_delay():.0f}s")
+
+    def next_delay(self):
+        """Seconds to wait before the next poll (exponential backoff while failing)."""
+        if self.failures == 0:
+            return self.poll_interval
+        return min(self.poll_interval * 2 ** (self.failures - 1), self.max_backoff)
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+
+class EndpointPoller(LiveClientPoller):
+    """
+    Polls the small Live Client endpoints instead of the full allgamedata document.
+    The first poll of a game fetches allgamedata once (players, full event history, gameVersion).
+    After that each tick requests /activeplayer, /gamestats and /eventdata?eventID=N (new events only)
+    concurrently, and /playerlist only every PLAYERLIST_INTERVAL or on the tick after a ChampionKill.
+    fetch() returns the merged snapshot in the allgamedata shape, so the monitor and triggers are unchanged;
+    the event list is one growing list shared across ticks.
+    """
+    def __init__(self, url=LIVE_CLIENT_URL, playerlist_interval=PLAYERLIST_INTERVAL, **kwargs):
+        super().__init__(url, **kwargs)
+        self.base_url = url.rsplit("/", 1)[0]
+        self.playerlist_interval = playerlist_interval
+        self._forget_game()
+
+    def _forget_game(self):
+        self.game_data = None
+        self.players = None
+        self.players_at = 0.0
+        self.events = None
+        self.next_event_id = 0
+
+    async def _get(self, path):
+        """(status, parsed JSON or None, body size) for one endpoint."""
+        async with self._get_session().get(f"{self.base_url}/{path}") as response:
+            if response.status != 200:
+                return response.status, None, 0
+            body = await response.read()
+        return 200, json.loads(body), len(body)
+
+    async def _fetch_full(self):
+        data = await super().fetch()
+        if data is None:
+            return None
+        self.game_data = data.get("gameData", {})
+        self.players = data.get("allPlayers", [])
+        self.players_at = time.monotonic()
+        self.events = data.setdefault("events", {})
+        self.events.setdefault("Events", [])
+        self.next_event_id = max((e.get("EventID", -1) for e in self.events["Events"]), default=-1) + 1
+        return data
+
+    def _merge_events(self, event_data):
+        new_events = [e for e in event_data.get("Events", []) if e.get("EventID", -1) >= self.next_event_id]
+        if new_events:
+            self.events["Events"].extend(new_events)
+            self.next_event_id = new_events[-1].get("EventID", self.next_event_id) + 1
+        self.events.update((key, value) for key, value in event_data.items() if key != "Events")
+        return new_events
+
+    async def fetch(self):
+        """Return a merged allgamedata-shaped snapshot, or None if the client is down / not in game."""
+        if self.events is None:
+            return await self._fetch_full()
+        start = time.perf_counter()
+        refresh_players = time.monotonic() - self.players_at >= self.playerlist_interval
+        paths = ["activeplayer", "gamestats", f"eventdata?eventID={self.next_event_id}"]
+        if refresh_players:
+            paths.append("playerlist")
+        try:
+            results = await asyncio.gather(*(self._get(path) for path in paths))
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            self.last_status = None
+            self._forget_game()
+            self._record_failure(type(e).__name__, start)
+            await self._record(0)
+            return None
+        except ValueError as e:
+            self._record_failure(f"Bad JSON: {e}", start)
+            return None
+        for path, (status, _, _) in zip(paths, results):
+            if status != 200:
+                self.last_status = status
+                self._forget_game()
+                self._record_failure(f"HTTP {status} on /{path.split('?')[0]}", start)
+                await self._record(status)
+                return None
+        self.last_status = 200
+        active_player, game_stats, event_data = (doc for _, doc, _ in results[:3])
+        if game_stats.get("gameTime", 0) < self.game_data.get("gameTime", 0):
+            print("🔁 [LiveClient] gameTime went backwards — new game, refetching allgamedata.")
+            self._forget_game()
+            return await self._fetch_full()
+        self.game_data = {**self.game_data, **game_stats}  # Keeps gameVersion from the full fetch
+        new_events = self._merge_events(event_data)
+        if refresh_players:
+            self.players = results[3][1]
+            self.players_at = time.monotonic()
+        elif any(e.get("EventName") == "ChampionKill" for e in new_events):
+            self.players_at = 0.0  # Scores changed; refresh the player list next tick
+        self.last_latency_ms = (time.perf_counter() - start) * 1000
+        if self.failures:
+            print(f"✅ [LiveClient] Reconnected after {self.failures} failed poll(s).")
+        self.failures = 0
+        size = sum(size for _, _, size in results)
+        print(f"[LiveClient] Poll OK in {self.last_latency_ms:.1f} ms ({size / 1024:.1f} KB, "
+              f"{len(new_events)} new event(s){', players' if refresh_players else ''})")
+        data = {"activePlayer": active_player, "allPlayers": self.players, "events": self.events, "gameData": self.game_data}
+        await self._record(200, data)
+        return data
+
+def create_poller(url=LIVE_CLIENT_URL, strategy=LIVE_CLIENT_FETCH):
+    """LiveClientPoller for the configured LIVE_CLIENT_FETCH strategy."""
+    if strategy == "allgamedata":
+        return LiveClientPoller(url)
+    return EndpointPoller(url)
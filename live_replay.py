@@ -0,0 +1,122 @@
+# live_replay.py
+# python live_replay.py recordings/session.jsonl.gz [--speed 4 | --speed max] [--port 2999] [--loop]
+# then run the bot with LIVE_CLIENT_URL=http://127.0.0.1:2999/liveclientdata/allgamedata
+# The sub-endpoints used by EndpointPoller (activeplayer, playerlist, gamestats, eventdata) are derived from each frame.
+import argparse
+import gzip
+import json
+import time
+from aiohttp import web
+
+API_ROOT = "/liveclientdata"
+ALLGAMEDATA_PATH = f"{API_ROOT}/allgamedata"
+
+def _event_data(data, request):
+    events = data.get("events", {})
+    first_id = int(request.query.get("eventID", 0))
+    return {**events, "Events": [e for e in events.get("Events", []) if e.get("EventID", -1) >= first_id]}
+
+ENDPOINTS = {
+    "allgamedata": lambda data, request: data,
+    "activeplayer": lambda data, request: data.get("activePlayer", {}),
+    "playerlist": lambda data, request: data.get("allPlayers", []),
+    "gamestats": lambda data, request: data.get("gameData", {}),
+    "eventdata": _event_data,
+}
+
+def load_session(path):
+    """Frames of a LIVE_CLIENT_RECORD session file. A truncated tail (crash mid-write) is ignored."""
+    frames = []
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    frames.append(json.loads(line))
+                except ValueError:
+                    break
+    except EOFError:
+        pass
+    if not frames:
+        raise SystemExit(f"❌ No frames in {path}")
+    return frames
+
+class SessionReplay:
+    """
+    Serves recorded frames back in recording time.
+    speed > 0 plays at that multiple of real time (1 = as recorded);
+    speed None ("max") moves to the next frame as soon as an endpoint is requested twice, i.e. once per
+    client poll, regardless of the clock.
+    Past the last frame the game is over: the last frame is served again, or playback restarts with loop=True.
+    """
+    def __init__(self, frames, speed=1.0, loop=False):
+        self.frames = frames
+        self.speed = speed
+        self.loop = loop
+        self.start = time.monotonic()
+        self.cursor = 0
+        self.served_paths = set()
+
+    def _frame_at(self, elapsed):
+        offset = self.frames[0]["t"]
+        duration = self.frames[-1]["t"] - offset
+        if self.loop and duration > 0:
+            elapsed %= duration
+            if self.frames[self.cursor]["t"] - offset > elapsed:
+                self.cursor = 0  # Wrapped around
+        while self.cursor + 1 < len(self.frames) and self.frames[self.cursor + 1]["t"] - offset <= elapsed:
+            self.cursor += 1
+        return self.frames[self.cursor]
+
+    def frame_for(self, endpoint):
+        if self.speed is not None:
+            return self._frame_at((time.monotonic() - self.start) * self.speed)
+        if endpoint in self.served_paths:
+            self.served_paths.clear()
+            if self.cursor + 1 < len(self.frames):
+                self.cursor += 1
+            elif self.loop:
+                self.cursor = 0
+        self.served_paths.add(endpoint)
+        return self.frames[self.cursor]
+
+    async def handle(self, request):
+        endpoint = request.match_info["endpoint"]
+        if endpoint not in ENDPOINTS:
+            return web.Response(status=404)
+        frame = self.frame_for(endpoint)
+        status = frame.get("status", 200)
+        if status == 200:
+            return web.json_response(ENDPOINTS[endpoint](frame["data"], request))
+        if status == 0:
+            return web.Response(status=503, text="Recorded as unreachable")
+        return web.Response(status=status)
+
+def parse_speed(value):
+    if value == "max":
+        return None
+    speed = float(value)
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be > 0 or 'max'")
+    return speed
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a recorded Live Client session on the Live Client API paths.")
+    parser.add_argument("session", help="gzip JSONL file written with LIVE_CLIENT_RECORD")
+    parser.add_argument("--speed", type=parse_speed, default=1.0, help="Playback multiplier, or 'max' for one frame per request")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2999)
+    parser.add_argument("--loop", action="store_true", help="Restart from the first frame after the last one")
+    args = parser.parse_args()
+
+    frames = load_session(args.session)
+    replay = SessionReplay(frames, speed=args.speed, loop=args.loop)
+    app = web.Application()
+    app.router.add_get(API_ROOT + "/{endpoint}", replay.handle)
+    speed_label = "max" if args.speed is None else f"{args.speed:g}x"
+    print(f"▶️ [Replay] {len(frames)} frame(s), {frames[-1]['t'] - frames[0]['t']:.0f}s recorded | {speed_label}"
+          f"{' | looping' if args.loop else ''}")
+    print(f"   LIVE_CLIENT_URL=http://{args.host}:{args.port}{ALLGAMEDATA_PATH}")
+    web.run_app(app, host=args.host, port=args.port, print=None)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# llm_gateway.py
+import asyncio
+import os
+import time
+from openai import AsyncOpenAI
+
+MAX_CONCURRENT_REQUESTS = 3  # Chat completions allowed in flight at once
+DEFAULT_TIMEOUT = 30  # Seconds before a completion is cancelled
+
+class LLMGateway:
+    """
+    Async front door for OpenAI chat completions.
+    Calls never block the event loop, at most `max_concurrency` run at once,
+    and each call is cancelled once its timeout expires.
+    """
+    def __init__(self, api_key=None, max_concurrency=MAX_CONCURRENT_REQUESTS, default_timeout=DEFAULT_TIMEOUT):
+        self.client = AsyncOpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"), max_retries=1)
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.default_timeout = default_timeout
+
+    async def chat(self, timeout=None, **request):
+        """
+        Run one chat completion. Raises asyncio.TimeoutError if it takes longer
+        than `timeout` (queue wait included); cancelling the caller cancels the request.
+        """
+        timeout = timeout or self.default_timeout
+        start = time.perf_counter()
+        async def _limited():
+            async with self.semaphore:
+                queued = time.perf_counter() - start
+                return await self.client.chat.completions.create(**request), queued
+        try:
+            response, queued = await asyncio.wait_for(_limited(), timeout)
+        except asyncio.TimeoutError:
+            print(f"[LLM] {request.get('model')} timed out after {timeout}s")
+            raise
+        print(f"[LLM] {request.get('model')} answered in {time.perf_counter() - start:.2f}s (queued {queued:.2f}s)")
+        return response
+
+    async def close(self):
+        await self.client.close()
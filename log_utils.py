@@ -1,20 +1,131 @@
-from datetime import datetime, timezone
+import atexit
 import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+
+LOG_ROOT = "logs"
+LOG_QUEUE_SIZE = 10000  # Lines buffered in memory before new ones are dropped
+FLUSH_INTERVAL = 0.5  # Seconds between forced flushes while lines keep coming
+
+class LogSink:
+    """
+    Background log writer.
+    Callers only enqueue (timestamp, file, text), never touching the disk. One daemon thread
+    keeps a buffered handle per file under logs/<UTC date>/, reopening them when the date
+    rolls over. If the queue is full, lines are dropped and counted, and the drops are
+    reported to errors.log as one summary line per file once the writer catches up.
+    """
+    def __init__(self, root=LOG_ROOT, max_queue=LOG_QUEUE_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.root = root
+        self.flush_interval = flush_interval
+        self.lines = queue.Queue(maxsize=max_queue)
+        self.handles = {}
+        self.handles_date = None
+        self.dropped = {}
+        self._dropped_lock = threading.Lock()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="LogSink", daemon=True)
+                self._thread.start()
+
+    def write(self, filename, text, stamped=True):
+        now = datetime.now(timezone.utc)
+        try:
+            self.lines.put_nowait((now, filename, text, stamped))
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped[filename] = self.dropped.get(filename, 0) + 1
+        self._ensure_thread()
+
+    def _handle(self, date_str, filename):
+        if date_str != self.handles_date:
+            self._close_handles()
+            self.handles_date = date_str
+        handle = self.handles.get(filename)
+        if handle is None:
+            log_dir = os.path.join(self.root, date_str)
+            os.makedirs(log_dir, exist_ok=True)
+            handle = open(os.path.join(log_dir, filename), "a", encoding="utf-8", buffering=64 * 1024)
+            self.handles[filename] = handle
+        return handle
+
+    def _write_line(self, timestamp, filename, text, stamped=True):
+        line = f"[{timestamp.isoformat()}] {text}\n" if stamped else f"{text}\n"
+        try:
+            self._handle(timestamp.strftime("%Y-%m-%d"), filename).write(line)
+        except Exception as e:
+            print(f"[ERROR] Failed to write {filename}: {e}")
+
+    def _report_drops(self):
+        with self._dropped_lock:
+            dropped, self.dropped = self.dropped, {}
+        now = datetime.now(timezone.utc)
+        for filename, count in dropped.items():
+            self._write_line(now, "errors.log", f"⚠️ [LogSink] {count} line(s) for {filename} dropped (queue full)")
+
+    def _flush_handles(self):
+        for handle in self.handles.values():
+            try:
+                handle.flush()
+            except Exception:
+                pass
+
+    def _close_handles(self):
+        for handle in self.handles.values():
+            try:
+                handle.close()
+            except Exception:
+                pass
+        self.handles = {}
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            try:
+                timestamp, filename, text, stamped = self.lines.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._flush_handles()
+                last_flush = time.monotonic()
+                continue
+            self._write_line(timestamp, filename, text, stamped)
+            if self.dropped:
+                self._report_drops()
+            if self.lines.empty() or time.monotonic() - last_flush >= self.flush_interval:
+                self._flush_handles()
+                last_flush = time.monotonic()
+            self.lines.task_done()  # Only after the flush, so flush() callers see lines on disk
+
+    def flush(self, timeout=5):
+        """Block until every queued line is on disk (or `timeout` seconds pass)."""
+        if self._thread is None:
+            return
+        deadline = time.monotonic() + timeout
+        while self.lines.unfinished_tasks and self._thread.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+log_sink = LogSink()
+atexit.register(log_sink.flush)
+
+def log_line(filename: str, text: str, stamped=True):
+    """Queue one line for logs/<date>/<filename> (prefixed with a timestamp unless stamped=False)."""
+    log_sink.write(filename, text, stamped)
 
-# Ensure logs folder exists
-os.makedirs("logs", exist_ok=True)
+def flush_logs(timeout=5):
+    log_sink.flush(timeout)
 
 def log_error(error_text: str):
-    timestamp = datetime.now(timezone.utc).isoformat()
-    with open("logs/errors.log", "a", encoding="utf-8") as error_file:
-        error_file.write(f"[{timestamp}] {error_text}\n")
+    log_line("errors.log", error_text)
 
 def log_event(event_text: str, filename="events.log"):
-    timestamp = datetime.now(timezone.utc).isoformat()
-    with open(f"logs/{filename}", "a", encoding="utf-8") as log_file:
-        log_file.write(f"[{timestamp}] {event_text}\n")
+    log_line(filename, event_text)
 
 def log_askai_question(user: str, question: str):
-    timestamp = datetime.now(timezone.utc).isoformat()
-    with open("logs/askai_log.txt", "a", encoding="utf-8") as log_file:
-        log_file.write(f"[{timestamp}] {user}: {question}\n")
+    log_line("askai_log.txt", f"{user}: {question}")
@@ -9,23 +9,34 @@ import os
 from datetime import datetime, timezone, timedelta
 import time
 import asyncio
+import concurrent.futures
+import queue
+import threading
 from shared_state import previous_state
 import json
 from dotenv import load_dotenv
+from embedding_cache import EmbeddingCache
+from log_utils import log_error, log_event
 
 # Cooldown map to prevent redundant summaries
 load_dotenv()
 _memory_summary_cooldowns = {}
 SUMMARY_COOLDOWN_SECONDS = 300  # 5 minutes
+NON_ASKAI_TYPES = ["game", "recap", "game_event"]  # Excluded from AskAI/global memory searches
+memory_query_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="memory-query")  # User + global searches in parallel
+WRITE_BATCH_WINDOW = 0.5  # Seconds to collect memory writes before committing them together
+WRITE_BATCH_MAX = 64  # Most writes embedded/added in one batch
 
 openai_api_key = os.getenv("OPENAI_API_KEY")
 openai_client = OpenAI(api_key=openai_api_key)
+EMBEDDING_MODEL = "text-embedding-3-small"
+embedding_cache = EmbeddingCache(EMBEDDING_MODEL)
 
 # ✅ Use PersistentClient to enable .persist()
 chroma_client = PersistentClient(path="./chromadb_memory")  # ✅ Stores data here
 embedding_fn = OpenAIEmbeddingFunction(
     api_key=openai_api_key,
-    model_name="text-embedding-3-small"  # Make sure this matches what you use in generate_embedding()
+    model_name=EMBEDDING_MODEL  # Only used if a raw query_texts/documents call slips through; we pass cached embeddings
 )
 collection = chroma_client.get_or_create_collection(
     name="zorobot_memory",
@@ -35,38 +46,106 @@ collection = chroma_client.get_or_create_collection(
 # ---- UTILITY ----
 
 def generate_embedding(text):
-    response = openai_client.embeddings.create(
-        model="text-embedding-3-small",
-        input=[text]
-    )
-    return response.data[0].embedding
+    return generate_embeddings([text])[0]
+
+def generate_embeddings(texts):
+    """Embed several texts, only calling OpenAI (in one request) for the ones not cached."""
+    vectors = [embedding_cache.get(text) for text in texts]
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+    if missing:
+        response = openai_client.embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=[texts[i] for i in missing]
+        )
+        for i, item in zip(missing, response.data):
+            vectors[i] = item.embedding
+            embedding_cache.put(texts[i], item.embedding)
+    return vectors
+
+def get_embedding_cache_stats():
+    return embedding_cache.stats()
 
 def get_current_game_id(stream_date, game_number):
     date_str = stream_date.replace("-", "")
     return f"game_{date_str}_{game_number}"
 
-def _get_log_path(log_filename: str) -> str:
-    date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    log_dir = os.path.join("logs", date_str)
-    os.makedirs(log_dir, exist_ok=True)
-    return os.path.join(log_dir, log_filename)
-def log_error(error_text: str):
-    timestamp = datetime.now(timezone.utc).isoformat()
-    path = _get_log_path("errors.log")
-    with open(path, "a", encoding="utf-8") as error_file:
-        error_file.write(f"[{timestamp}] {error_text}\n")
-def log_event(message: str):
-    timestamp = datetime.now(timezone.utc).isoformat()
-    path = _get_log_path("events.log")
-    with open(path, "a", encoding="utf-8") as log_file:
-        log_file.write(f"[{timestamp}] {message}\n")
+# ---- WRITE-BEHIND QUEUE ----
+
+class MemoryWriteQueue:
+    """
+    Write-behind buffer for memory inserts.
+    Callers return immediately; a background thread collects writes for a short
+    window, embeds them in one request and commits them with one collection.add.
+    """
+    def __init__(self, window=WRITE_BATCH_WINDOW, max_batch=WRITE_BATCH_MAX):
+        self.window = window
+        self.max_batch = max_batch
+        self.pending = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="MemoryWriteQueue", daemon=True)
+                self._thread.start()
+
+    def put(self, embed_text, document, metadata):
+        self.pending.put((embed_text, document, metadata, str(uuid.uuid4())))
+        self._ensure_worker()
+
+    def _run(self):
+        while True:
+            batch = [self.pending.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._commit(batch)
+            finally:
+                for _ in batch:
+                    self.pending.task_done()
+
+    def _commit(self, batch):
+        try:
+            embeddings = generate_embeddings([embed_text for embed_text, _, _, _ in batch])
+            collection.add(
+                documents=[document for _, document, _, _ in batch],
+                metadatas=[metadata for _, _, metadata, _ in batch],
+                ids=[entry_id for _, _, _, entry_id in batch],
+                embeddings=embeddings
+            )
+            print(f"💾 [Memory] Committed {len(batch)} write(s) in one batch")
+        except Exception as e:
+            log_error(f"[MemoryWriteQueue ERROR] Dropped {len(batch)} write(s): {e}")
+
+    def flush(self, timeout=10):
+        """Block until every queued write is committed (or `timeout` seconds pass)."""
+        if self._thread is None:
+            return True
+        deadline = time.monotonic() + timeout
+        while self.pending.unfinished_tasks:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                print(f"⚠️ [Memory] Flush gave up with {self.pending.unfinished_tasks} write(s) pending")
+                return False
+            time.sleep(0.05)
+        return True
+
+memory_writes = MemoryWriteQueue()
+
+def flush_memory_writes(timeout=10):
+    return memory_writes.flush(timeout)
 
 # ---- CORE FUNCTIONS ----
 
 def add_to_memory(content, type_, stream_date, game_number, metadata=None):
     game_id = get_current_game_id(stream_date, game_number)
-    embedding = generate_embedding(content)
-    entry_id = str(uuid.uuid4())
     full_metadata = {
         "type": type_,
         "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -76,17 +155,10 @@ def add_to_memory(content, type_, stream_date, game_number, metadata=None):
     }
     if metadata:
         full_metadata.update(metadata)
-    collection.add(
-        documents=[content],
-        metadatas=[full_metadata],
-        ids=[entry_id],
-        embeddings=[embedding]
-    )
+    memory_writes.put(content, content, full_metadata)
 
 def add_game_memory(content, stream_date, game_number, metadata=None):
     game_id = get_current_game_id(stream_date, game_number)
-    embedding = generate_embedding(content)
-    entry_id = str(uuid.uuid4())
     # ⏱ Format game time
     seconds = previous_state.get("last_game_time", 0)
     minutes = int(seconds // 60)
@@ -138,64 +210,46 @@ def add_game_memory(content, stream_date, game_number, metadata=None):
     }
     if metadata:
         full_metadata.update(metadata)
-    collection.add(
-        documents=[full_content],
-        metadatas=[full_metadata],
-        ids=[entry_id],
-        embeddings=[embedding]
-    )
+    # Embedded on the raw event text, stored with the scoreboard context
+    memory_writes.put(content, full_content, full_metadata)
+
+def _query_hits(embedding, n_results, where):
+    result = collection.query(query_embeddings=[embedding], n_results=n_results, where=where)
+    return list(zip(result.get("documents", [[]])[0], result.get("metadatas", [[]])[0]))
 
-def query_memory_relevant(prompt, user=None, top_k_user=4, top_k_global=2):
+def query_memory_relevant(prompt, user=None, top_k_user=4, top_k_global=2, embedding=None):
     try:
         results = []
         seen_docs = set()  # track to avoid duplicates
+        limit = top_k_user + top_k_global
+        if embedding is None:
+            embedding = generate_embedding(prompt)
+        # 🧠 The user and global searches share one embedding and run side by side.
+        # The global search also serves as the fallback, so it fetches at least top_k_user hits.
+        global_search = memory_query_executor.submit(
+            _query_hits, embedding, max(top_k_global + 3, top_k_user), {"type": {"$nin": NON_ASKAI_TYPES}}
+        )
+        user_hits = _query_hits(embedding, top_k_user, {"user": user}) if user else []
+        global_hits = global_search.result()
         # 🧠 1. User-specific results
-        user_docs = []
-        user_metas = []
-        if user:
-            user_results = collection.query(
-                query_texts=[prompt],
-                n_results=top_k_user,
-                where={"user": user}
-            )
-            user_docs = user_results.get("documents", [[]])[0]
-            user_metas = user_results.get("metadatas", [[]])[0]
-            for doc, meta in zip(user_docs, user_metas):
-                if doc not in seen_docs:
-                    results.append((doc, meta))
-                    seen_docs.add(doc)
+        for doc, meta in user_hits:
+            if doc not in seen_docs:
+                results.append((doc, meta))
+                seen_docs.add(doc)
         # 🧠 2. Global results (skip duplicates)
-        global_results = collection.query(
-            query_texts=[prompt],
-            n_results=top_k_global + 3,  # overfetch in case of duplicates
-            where={
-                "type": {"$nin": ["game", "recap", "game_event"]}
-            }
-        )
-        global_docs = global_results.get("documents", [[]])[0]
-        global_metas = global_results.get("metadatas", [[]])[0]
-        for doc, meta in zip(global_docs, global_metas):
+        for doc, meta in global_hits[:top_k_global + 3]:  # overfetch in case of duplicates
             if doc not in seen_docs:
                 results.append((doc, meta))
                 seen_docs.add(doc)
-            if len(seen_docs) >= top_k_user + top_k_global:
+            if len(seen_docs) >= limit:
                 break
         # 🧠 3. Fallback (only if user returned nothing)
-        if user and not user_docs:
-            fallback_results = collection.query(
-                query_texts=[prompt],
-                n_results=top_k_user,
-                where={
-                "type": {"$nin": ["game", "recap", "game_event"]}
-                }
-            )
-            fallback_docs = fallback_results.get("documents", [[]])[0]
-            fallback_metas = fallback_results.get("metadatas", [[]])[0]
-            for doc, meta in zip(fallback_docs, fallback_metas):
+        if user and not user_hits:
+            for doc, meta in global_hits[:top_k_user]:
                 if doc not in seen_docs:
                     results.append((doc, meta))
                     seen_docs.add(doc)
-                if len(seen_docs) >= top_k_user + top_k_global:
+                if len(seen_docs) >= limit:
                     break
         return results
     except Exception as e:
@@ -206,6 +260,7 @@ def clear_memory():
     collection.delete(where={})  # Clears all entries
 
 def close_memory():
+    print(f"🧮 Embedding cache: {embedding_cache.stats()}")
     try:
         chroma_client.persist()
         print("💾 Memory changes persisted.")
@@ -263,7 +318,8 @@ def count_user_memories(user, type_="askai"):
 
 def summarize_and_replace_user_memories(user, type_="askai"):
     try:
-        # Step 1: Fetch all memories for this user (one filter only)
+        # Step 1: Fetch all memories for this user (one filter only), including queued writes
+        flush_memory_writes()
         results = collection.get(where={"user": user})
         docs = results.get("documents", [])
         ids = results.get("ids", [])
@@ -313,11 +369,13 @@ async def summarize_and_replace_user_memories_async(user, type_="askai"):
     _memory_summary_cooldowns[user] = now_ts
     await asyncio.to_thread(summarize_and_replace_user_memories, user, type_)
 
-def query_memory_for_game(prompt, game_id, top_k=5):
+def query_memory_for_game(prompt, game_id, top_k=5, embedding=None):
     try:
+        if embedding is None:
+            embedding = generate_embedding(prompt)
         # Step 1: Query only using game_id
         results = collection.query(
-            query_texts=[prompt],
+            query_embeddings=[embedding],
             n_results=top_k *3,  # Fetch extra to allow filtering
             where={"game_id": game_id}
         )
@@ -337,13 +395,13 @@ def query_memory_for_game(prompt, game_id, top_k=5):
         log_error(f"[Game Memory Query ERROR] {e}")
         return []
 
-def query_memory_for_askai(prompt, user, top_k_user=4, top_k_global=2):
-    return query_memory_relevant(prompt, user=user, top_k_user=top_k_user, top_k_global=top_k_global)
+def query_memory_for_askai(prompt, user, top_k_user=4, top_k_global=2, embedding=None):
+    return query_memory_relevant(prompt, user=user, top_k_user=top_k_user, top_k_global=top_k_global, embedding=embedding)
 
-def query_memory_for_type(prompt, type_, user, game_id=None):
+def query_memory_for_type(prompt, type_, user, game_id=None, embedding=None):
     if type_ in ["game", "recap"]:
-        return query_memory_for_game(prompt, game_id)
-    return query_memory_for_askai(prompt, user)
+        return query_memory_for_game(prompt, game_id, embedding=embedding)
+    return query_memory_for_askai(prompt, user, embedding=embedding)
 
 def delete_old_game_memories(days_old=0, types_to_delete=("game", "game_event", "recap","Game")):
     cutoff = datetime.now(timezone.utc) - timedelta(days=days_old)
@@ -1,36 +1,66 @@
 # obs_controller.py
 
 import os
+import asyncio
+import concurrent.futures
+import threading
 from dotenv import load_dotenv
 from obswebsocket import obsws, requests
 from obswebsocket.exceptions import ConnectionFailure
-from datetime import datetime, timezone
+from log_utils import log_line
+from overlay_files import overlay_files
 
 # Load .env variables
 load_dotenv()
 
+# OBS events after which cached scene / scene-item ids may be stale
+SCENE_CACHE_EVENTS = {
+    "SceneCreated", "SceneRemoved", "SceneNameChanged", "SceneListChanged",
+    "SceneItemCreated", "SceneItemRemoved", "SceneItemListReindexed", "InputNameChanged",
+}
+
 def log_obs_event(text: str):
-    try:
-        timestamp = datetime.now(timezone.utc).isoformat()
-        date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        log_dir = os.path.join("logs", date_str)
-        os.makedirs(log_dir, exist_ok=True)
-        with open(os.path.join(log_dir, "obs.log"), "a", encoding="utf-8") as log_file:
-            log_file.write(f"[{timestamp}] {text}\n")
-    except Exception as e:
-        print(f"[ERROR] Failed to write OBS log: {e}")
+    log_line("obs.log", text)
 
 class OBSController:
+    """
+    obs-websocket wrapper.
+    The current scene and each scene's source → sceneItemId map are cached and
+    invalidated from OBS events, so a toggle is one request instead of three.
+    The *_async methods run on a single OBS worker thread (obsws calls are blocking),
+    grouping related requests (text + visibility) into one hop off the event loop.
+    """
     def __init__(self, host=None, port=None, password=None):
         self.host = host or os.getenv("OBS_HOST", "localhost")
         self.port = int(port or os.getenv("OBS_PORT", 4455))
         self.password = password or os.getenv("OBS_PASSWORD", "")
         self.ws = None
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="obs")
+        self.current_scene = None
+        self.scene_items = {}  # scene name → {source name: sceneItemId}
+        self._cache_lock = threading.Lock()
+
+    def _on_event(self, event):
+        # Runs on obsws' receive thread
+        with self._cache_lock:
+            if event.name == "CurrentProgramSceneChanged":
+                self.current_scene = event.datain.get("sceneName")
+            elif event.name in SCENE_CACHE_EVENTS:
+                self.scene_items.clear()
+                if event.name in ("SceneRemoved", "SceneNameChanged", "SceneListChanged"):
+                    self.current_scene = None
+
+    def invalidate_cache(self):
+        with self._cache_lock:
+            self.current_scene = None
+            self.scene_items.clear()
 
     def connect(self):
         try:
             self.ws = obsws(self.host, self.port, self.password)
+            self.ws.register(self._on_event)
             self.ws.connect()
+            self.invalidate_cache()
             print(f"✅ Connected to OBS WebSocket at ws://{self.host}:{self.port}")
             log_obs_event(f"Connected to OBS WebSocket at ws://{self.host}:{self.port}")
         except ConnectionFailure as e:
@@ -39,6 +69,7 @@ class OBSController:
 
     def disconnect(self):
         if self.ws:
+            self.ws.unregister(self._on_event)
             self.ws.disconnect()
             print("🔌 OBS WebSocket disconnected.")
             log_obs_event("OBS WebSocket disconnected.")
@@ -51,7 +82,7 @@ class OBSController:
             print(f"❌ Failed to switch scene: {e}")
             log_obs_event(f"❌ Failed to switch scene: {e}")
 
-    def show_source(self, source_name, scene=None):
+    def set_source_visible(self, source_name, visible, scene=None):
         try:
             scene_name = scene or self.get_current_scene()
             scene_item_id = self.get_scene_item_id(source_name, scene_name)
@@ -59,23 +90,16 @@ class OBSController:
                 self.ws.call(requests.SetSceneItemEnabled(
                     sceneName=scene_name,
                     sceneItemId=scene_item_id,
-                    sceneItemEnabled=True
+                    sceneItemEnabled=visible
                 ))
         except Exception as e:
-            print(f"❌ Failed to show source '{source_name}': {e}")
+            print(f"❌ Failed to {'show' if visible else 'hide'} source '{source_name}': {e}")
+
+    def show_source(self, source_name, scene=None):
+        self.set_source_visible(source_name, True, scene)
 
     def hide_source(self, source_name, scene=None):
-        try:
-            scene_name = scene or self.get_current_scene()
-            scene_item_id = self.get_scene_item_id(source_name, scene_name)
-            if scene_item_id:
-                self.ws.call(requests.SetSceneItemEnabled(
-                    sceneName=scene_name,
-                    sceneItemId=scene_item_id,
-                    sceneItemEnabled=False
-                ))
-        except Exception as e:
-            print(f"❌ Failed to hide source '{source_name}': {e}")
+        self.set_source_visible(source_name, False, scene)
 
     def set_text(self, source_name, text):
         try:
@@ -99,15 +123,9 @@ class OBSController:
             self.set_text(source_name, display_text)
             log_obs_event("Updated AskAI text overlay (Q&A)")
 
-            # 🔥 Write HTML overlay data: atomic write via temp file → rename
-            os.makedirs("overlays", exist_ok=True)
-            temp_path = "overlays/askai_data_temp.txt"
-            final_path = "overlays/askai_data.txt"
-            with open(temp_path, "w", encoding="utf-8") as f:
-                f.write(f"{question}||{answer}")
-            os.replace(temp_path, final_path)  # Atomic rename
-
-            log_obs_event("Updated AskAI HTML overlay data (atomic write)")
+            # 🔥 HTML overlay data (overlays/askai_data.txt): debounced atomic write on the writer thread
+            overlay_files.write("askai", f"{question}||{answer}")
+            log_obs_event("Queued AskAI HTML overlay data")
         except Exception as e:
             print(f"❌ Failed to update AskAI overlay: {e}")
             log_obs_event(f"❌ Failed to update AskAI overlay: {e}")
@@ -115,10 +133,16 @@ class OBSController:
 
     def get_scene_item_id(self, source_name, scene_name):
         try:
-            items = self.ws.call(requests.GetSceneItemList(sceneName=scene_name)).getSceneItems()
-            for item in items:
-                if item['sourceName'] == source_name:
-                    return item['sceneItemId']
+            with self._cache_lock:
+                items = self.scene_items.get(scene_name)
+            if items is None or source_name not in items:
+                # One GetSceneItemList fills the whole scene's map
+                listed = self.ws.call(requests.GetSceneItemList(sceneName=scene_name)).getSceneItems()
+                items = {item['sourceName']: item['sceneItemId'] for item in listed}
+                with self._cache_lock:
+                    self.scene_items[scene_name] = items
+            if source_name in items:
+                return items[source_name]
             raise ValueError(f"Scene item '{source_name}' not found in scene '{scene_name}'")
         except Exception as e:
             print(f"❌ Error getting scene item ID for '{source_name}': {e}")
@@ -132,8 +156,30 @@ class OBSController:
             print(f"❌ Failed to update event overlay: {e}")
 
     def get_current_scene(self):
+        with self._cache_lock:
+            if self.current_scene:
+                return self.current_scene
         try:
-            return self.ws.call(requests.GetCurrentProgramScene()).getName()
+            response = self.ws.call(requests.GetCurrentProgramScene())
+            scene_name = response.datain.get("sceneName") or response.datain.get("currentProgramSceneName")
+            with self._cache_lock:
+                self.current_scene = scene_name
+            return scene_name
         except Exception as e:
             print(f"❌ Failed to get current scene: {e}")
             return None
+
+    # ---- ASYNC API (event-loop safe) ----
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def set_text_async(self, source_name, text):
+        await self._run(self.set_text, source_name, text)
+
+    async def update_ai_overlay_async(self, question: str, answer: str, source_name="AskAI_Display"):
+        await self._run(self.update_ai_overlay, question, answer, source_name)
+
+    async def update_event_overlay_async(self, text, source_name="Event_Display"):
+        await self._run(self.update_event_overlay, text, source_name)
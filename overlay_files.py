@@ -0,0 +1,76 @@
+# overlay_files.py
+import os
+import threading
+import time
+
+OVERLAY_DIR = "overlays"
+DEBOUNCE_SECONDS = 0.15  # Rapid updates to one slot within this window collapse into one write
+
+class OverlayFileWriter:
+    """
+    Background writer for the file-polling HTML overlays.
+    write() just records the latest content of a named slot (e.g. "askai" →
+    overlays/askai_data.txt). A daemon thread writes each slot once it has been
+    quiet for DEBOUNCE_SECONDS, atomically (temp file → os.replace), and only if
+    the content differs from what is already on disk.
+    """
+    def __init__(self, directory=OVERLAY_DIR, debounce=DEBOUNCE_SECONDS):
+        self.directory = directory
+        self.debounce = debounce
+        self.pending = {}  # slot → (content, last update time)
+        self.written = {}  # slot → content last written
+        self._condition = threading.Condition()
+        self._thread = None
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, slot):
+        return os.path.join(self.directory, f"{slot}_data.txt")
+
+    def write(self, slot, content):
+        with self._condition:
+            self.pending[slot] = (content, time.monotonic())
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="OverlayFileWriter", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _due(self):
+        now = time.monotonic()
+        due = {slot: content for slot, (content, updated) in self.pending.items() if now - updated >= self.debounce}
+        for slot in due:
+            del self.pending[slot]
+        wait = min((self.debounce - (now - updated) for _, updated in self.pending.values()), default=None)
+        return due, wait
+
+    def _run(self):
+        while True:
+            with self._condition:
+                due, wait = self._due()
+                while not due:
+                    self._condition.wait(timeout=wait)
+                    due, wait = self._due()
+            for slot, content in due.items():
+                self._write_slot(slot, content)
+
+    def _write_slot(self, slot, content):
+        if self.written.get(slot) == content:
+            return
+        final_path = self.path(slot)
+        temp_path = f"{final_path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(temp_path, final_path)  # Atomic rename
+            self.written[slot] = content
+        except OSError as e:
+            print(f"❌ Failed to write overlay slot '{slot}': {e}")
+
+    def flush(self):
+        """Write every pending slot now (used on shutdown)."""
+        with self._condition:
+            pending = {slot: content for slot, (content, _) in self.pending.items()}
+            self.pending.clear()
+        for slot, content in pending.items():
+            self._write_slot(slot, content)
+
+overlay_files = OverlayFileWriter()
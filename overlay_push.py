@@ -1,10 +1,13 @@
 #overlay_push.py
-from overlay_ws_server import broadcast
+from overlay_ws_server import broadcast, set_snapshot
 import asyncio
 
 # === Overlay Push Utilities ===
 recent_cooldown_popups = set()
 session_cost_total = 0.0
+POWER_PROTOCOL_VERSION = 2
+# Last power_scores state the overlays were sent; deltas are computed against it
+power_scores_state = {"seq": 0, "players": None, "order_total": 0, "chaos_total": 0}
 
 async def push_askai_overlay(question: str, answer: str):
     """Send AskAI Question & Answer to overlay via WebSocket."""
@@ -68,6 +71,16 @@ async def push_cost_overlay(amount):
         "amount": amount
     })
 
+def _power_snapshot():
+    return {
+        "type": "power_scores",
+        "v": POWER_PROTOCOL_VERSION,
+        "seq": power_scores_state["seq"],
+        "players": power_scores_state["players"] or [],
+        "order_total": power_scores_state["order_total"],
+        "chaos_total": power_scores_state["chaos_total"]
+    }
+
 async def push_power_scores(payload):
     """
     Send player power data and team totals to overlay.
@@ -75,13 +88,40 @@ async def push_power_scores(payload):
       - players: list of player dicts (name, score, team, role)
       - order_total: float
       - chaos_total: float
+    The full list goes out only when the roster changes (or on connect/resync, from the
+    server's snapshot); otherwise a power_scores_delta with [index, score] pairs is sent.
+    Every message carries a seq; a delta also names the seq it applies to ("base").
     """
-    await broadcast({
-        "type": "power_scores",
-        "players": payload.get("players", []),
-        "order_total": payload.get("order_total", 0),
-        "chaos_total": payload.get("chaos_total", 0)
+    players = payload.get("players", [])
+    order_total = payload.get("order_total", 0)
+    chaos_total = payload.get("chaos_total", 0)
+    previous = power_scores_state["players"]
+    same_roster = previous is not None and len(previous) == len(players) and all(
+        (old["name"], old["team"], old["role"]) == (new["name"], new["team"], new["role"])
+        for old, new in zip(previous, players)
+    )
+    if same_roster:
+        scores = [[i, new["score"]] for i, (old, new) in enumerate(zip(previous, players)) if old["score"] != new["score"]]
+        if not scores and order_total == power_scores_state["order_total"] and chaos_total == power_scores_state["chaos_total"]:
+            return  # Nothing changed
+        message = {
+            "type": "power_scores_delta",
+            "v": POWER_PROTOCOL_VERSION,
+            "base": power_scores_state["seq"],
+            "seq": power_scores_state["seq"] + 1,
+            "scores": scores,
+            "order_total": order_total,
+            "chaos_total": chaos_total
+        }
+    power_scores_state.update({
+        "seq": power_scores_state["seq"] + 1,
+        "players": [dict(p) for p in players],
+        "order_total": order_total,
+        "chaos_total": chaos_total
     })
+    snapshot = _power_snapshot()
+    set_snapshot("power_scores", snapshot)
+    await broadcast(message if same_roster else snapshot)
 
 async def push_toggle_power_overlay(visible: bool):
     await broadcast({
@@ -3,12 +3,63 @@ import asyncio
 import websockets
 import json
 import os
+import itertools
+from collections import OrderedDict
 
 PORT = int(os.getenv("OVERLAY_WS_PORT", 8765))
-# Set of all connected overlay clients
-connected_clients = set()
+CLIENT_QUEUE_SIZE = 32  # Undelivered messages kept per client before the oldest are dropped
+# State-like messages: only the latest one matters, so a queued one is replaced by its successor
+COALESCED_TYPES = {"power_scores", "cost", "mood", "game_number", "toggle_power", "replay"}
+# Patches only make sense on top of the state they were computed against; the snapshot covers them
+NOT_REPLAYED_TYPES = {"power_scores_delta"}
+# websocket → OverlayClient for all connected overlay clients
+connected_clients = {}
+last_sent = {}  # type → last serialized state-like message, to skip identical resends
+# type → last message of that type (mood, power_scores, cost, visible askai/event cards, ...).
+# "<type>_hide" removes "<type>". Replayed as one frame to new clients and on {"type": "resync"}.
+last_values = {}
+_message_ids = itertools.count()
 print("💡 overlay_ws_server.py loaded")
 
+class OverlayClient:
+    """
+    One connected overlay with its own bounded send queue and sender task,
+    so a slow browser source only delays itself.
+    """
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.pending = OrderedDict()  # key → serialized message, in send order
+        self.wakeup = asyncio.Event()
+        self.dropped = 0
+        self.sender = asyncio.create_task(self._send_loop())
+
+    def enqueue(self, msg_type, message):
+        key = msg_type if msg_type in COALESCED_TYPES else next(_message_ids)
+        self.pending.pop(key, None)  # Superseded state goes away, the new one queues at the back
+        if len(self.pending) >= CLIENT_QUEUE_SIZE:
+            self.pending.popitem(last=False)
+            self.dropped += 1
+            print(f"[WS] Client {id(self.websocket)} is falling behind — dropped {self.dropped} message(s) so far")
+        self.pending[key] = message
+        self.wakeup.set()
+
+    async def _send_loop(self):
+        try:
+            while True:
+                await self.wakeup.wait()
+                self.wakeup.clear()
+                while self.pending:
+                    _, message = self.pending.popitem(last=False)
+                    await self.websocket.send(message)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"[WS BROADCAST ERROR] Client send failed: {e}")
+            connected_clients.pop(self.websocket, None)
+
+    def close(self):
+        self.sender.cancel()
+
 def get_current_mood():
     try:
         with open("current_mode.txt", "r") as f:
@@ -19,36 +70,61 @@ def get_current_mood():
 async def handler(websocket):
     client_id = id(websocket)
     print(f"[WS] Overlay connected - ID: {id(websocket)} | Total: {len(connected_clients)}")
-    connected_clients.add(websocket)
-        # 🧠 Immediately send current mood to the just-connected overlay
-    try:
-        current_mood = get_current_mood()
-        await websocket.send(json.dumps({
-            "type": "mood",
-            "text": current_mood
-        }))
-        print(f"[WS] Sent initial mood '{current_mood}' to client {client_id}")
-    except Exception as e:
-        print(f"[WS] Failed to send initial mood to {client_id}: {e}")
+    client = OverlayClient(websocket)
+    connected_clients[websocket] = client
+    # 🧠 Immediately bring the just-connected overlay up to date in one frame
+    if "mood" not in last_values:
+        last_values["mood"] = {"type": "mood", "text": get_current_mood()}
+    send_replay(client)
+    print(f"[WS] Sent replay of {len(last_values)} message type(s) to client {client_id}")
     try:
         async for message in websocket:
             print("Received from overlay:", message)
+            try:
+                request = json.loads(message)
+            except ValueError:
+                continue
+            if isinstance(request, dict) and request.get("type") == "resync":
+                send_replay(client)
     except websockets.exceptions.ConnectionClosed:
         print("[WS] Overlay disconnected")
     finally:
-        connected_clients.discard(websocket)
+        connected_clients.pop(websocket, None)
+        client.close()
+
+def set_snapshot(msg_type, data):
+    """Remember the full state for `msg_type`; delta protocols use it to (re)sync clients."""
+    last_values[msg_type] = data
+
+def remember(data):
+    msg_type = data.get("type")
+    if not msg_type or msg_type in NOT_REPLAYED_TYPES:
+        return
+    if msg_type.endswith("_hide"):
+        last_values.pop(msg_type[:-len("_hide")], None)
+    else:
+        last_values[msg_type] = data
+
+def send_replay(client):
+    client.enqueue("replay", json.dumps({
+        "type": "replay",
+        "messages": list(last_values.values())
+    }))
 
 async def broadcast(data):
-    if connected_clients:
-        message = json.dumps(data)
-        disconnected = set()
-        for client in connected_clients:
-            try:
-                await client.send(message)
-            except Exception as e:
-                print(f"[WS BROADCAST ERROR] Client send failed: {e}")
-                disconnected.add(client)
-        connected_clients.difference_update(disconnected)
+    """
+    Queue a message for every connected overlay and return without waiting on sends.
+    State-like messages identical to the last one broadcast are skipped.
+    """
+    msg_type = data.get("type")
+    remember(data)
+    message = json.dumps(data)
+    if msg_type in COALESCED_TYPES:
+        if last_sent.get(msg_type) == message:
+            return
+        last_sent[msg_type] = message
+    for client in list(connected_clients.values()):
+        client.enqueue(msg_type, message)
 
 async def start_server():
     print(f"Starting WebSocket server on ws://localhost:{PORT}")
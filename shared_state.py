@@ -1,9 +1,11 @@
 # shared_state.py
 from game_tracker import GameTracker
+from utils.event_store import GameEventStore
 previous_state = {}
 player_ratings = {}
-inhib_respawn_timer = {"ORDER": [], "CHAOS": []}
-baron_expire = {}
-elder_expire = {}
-seen_inhib_events = set()
-tracker = GameTracker()
\ No newline at end of file
+event_store = GameEventStore()
+# Live views into the event store (cleared in place by event_store.reset())
+inhib_respawn_timer = event_store.inhib_respawn_timer
+baron_expire = event_store.baron_expire
+elder_expire = event_store.elder_expire
+tracker = GameTracker()
@@ -49,10 +49,21 @@ def setup_shutdown_hooks(bot_instance=None, executor=None):
         except Exception as e:
             print(f"⚠️ Failed to cancel tts_monitor_task cleanly: {e}")
         try:
-            from memory_manager import close_memory
+            from memory_manager import flush_memory_writes, close_memory
+            flush_memory_writes()
             close_memory()
         except Exception as e:
             print(f"⚠️ Error while closing memory: {e}")
+        try:
+            from overlay_files import overlay_files
+            overlay_files.flush()
+        except Exception as e:
+            print(f"⚠️ Error while flushing overlay files: {e}")
+        try:
+            from log_utils import flush_logs
+            flush_logs()  # os._exit skips atexit, so drain the log queue ourselves
+        except Exception as e:
+            print(f"⚠️ Error while flushing logs: {e}")
                 
         list_all_threads()
         os._exit(0)
@@ -1,4 +1,4 @@
-from memory_manager import add_to_memory
+from memory_manager import add_to_memory, flush_memory_writes
 
 add_to_memory(
     content="This is a test memory item.",
@@ -7,5 +7,6 @@ add_to_memory(
     game_number=1,
     metadata={"note": "manual test"}
 )
+flush_memory_writes()
 
 print("✅ Added test memory.")
@@ -0,0 +1,51 @@
+# python -m pytest test_trigger_deltas.py  (needs OPENAI_API_KEY set, like the bot)
+import asyncio
+import tempfile
+import log_utils
+
+log_utils.log_sink.root = tempfile.mkdtemp(prefix="test_logs_")
+
+from game_data_monitor import process_tick, set_triggers
+from game_snapshot import GameSnapshot
+from shared_state import previous_state, event_store
+from triggers.game_triggers import KillCountTrigger, DeathTrigger
+
+def _payload(kills, deaths, game_time=1500.0):
+    players = [
+        {"summonerName": "You", "riotId": "You#EUW", "team": "ORDER", "position": "MIDDLE", "level": 12, "items": [],
+         "scores": {"kills": kills, "deaths": deaths, "assists": 0, "creepScore": 150, "wardScore": 10}},
+        {"summonerName": "Them", "riotId": "Them#EUW", "team": "CHAOS", "position": "MIDDLE", "level": 12, "items": [],
+         "scores": {"kills": deaths, "deaths": kills, "assists": 0, "creepScore": 150, "wardScore": 10}},
+    ]
+    return {
+        "activePlayer": {"riotId": "You#EUW", "currentGold": 500, "championStats": {"currentHealth": 800, "maxHealth": 1500}},
+        "allPlayers": players,
+        "events": {"Events": []},
+        "gameData": {"gameTime": game_time},
+    }
+
+def _start_game():
+    previous_state.clear()
+    event_store.reset()
+    set_triggers([KillCountTrigger(), DeathTrigger()])
+    snapshot = GameSnapshot(kills=0, deaths=0, hp=800, your_team="ORDER", your_name="You", last_game_time=1495.0)
+    previous_state.update({"snapshot": snapshot, "your_team": "ORDER", "your_name": "You",
+                           "last_game_time": 1495.0, "initialized": True, "game_ended": False})
+
+def _tick(payload):
+    results = []
+    asyncio.run(process_tick(payload, lambda data, you, snapshot, merged: results.extend(merged)))
+    return results
+
+def test_final_kill_is_announced_once_after_game_end():
+    _start_game()
+    previous_state["game_ended"] = True  # GameEnd already seen; the end-of-game snapshot stays frozen
+    final = _payload(kills=1, deaths=1)
+    first = _tick(final)
+    assert any("You" in line for line in first) and len(first) == 2  # One kill line, one death line
+    assert _tick(final) == []
+    assert previous_state["snapshot"].kills == 0
+
+if __name__ == "__main__":
+    test_final_kill_is_announced_once_after_game_end()
+    print("✅ Trigger deltas OK.")
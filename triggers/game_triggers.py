@@ -3,11 +3,31 @@
 import time
 import random
 from collections import defaultdict, Counter
+from utils.roster import RosterIndex
+
+def get_roster(current_data):
+    """Roster index built by the monitor for this tick (rebuilt only if a caller didn't pass one)."""
+    roster = current_data.get("roster")
+    if roster is None:
+        roster = RosterIndex(current_data.get("allPlayers", []))
+    return roster
 
 class GameTrigger:
-    """Base class for all game triggers."""
+    """
+    Base class for all game triggers.
+    The monitor's dispatcher picks the cheapest hook a trigger opts into:
+      - event_names → check_events() gets only the *new* events with those EventNames
+      - stat_keys   → check_stats() runs only when one of those stats changed since last poll
+      - otherwise   → check() runs every poll
+    """
+    event_names = ()
+    stat_keys = ()
     def check(self, current_data: dict, previous_data: dict) -> str | None:
         return None
+    def check_events(self, events: list, current_data: dict, previous_data: dict) -> str | None:
+        return None
+    def check_stats(self, deltas: dict, current_data: dict, previous_data: dict) -> str | None:
+        return None
 
 
 class HPDropTrigger(GameTrigger):
@@ -44,12 +64,13 @@ class HPDropTrigger(GameTrigger):
 
 class CSMilestoneTrigger(GameTrigger):
     """Trigger when a new CS milestone is reached (30, 60, etc)."""
+    stat_keys = ("cs",)
     def __init__(self, step=70):
         self.step = step
         self.last_milestone = 0
     def reset(self):
         self.last_milestone = 0
-    def check(self, current_data, previous_data):
+    def check_stats(self, deltas, current_data, previous_data):
         cs = current_data.get("cs", 0)
         milestone = (cs // self.step) * self.step
         if milestone > self.last_milestone:
@@ -65,27 +86,25 @@ class CSMilestoneTrigger(GameTrigger):
 
 class KillCountTrigger(GameTrigger):
     """Trigger when kills increase, with milestone memory."""
+    stat_keys = ("kills",)
     def __init__(self):
-        self.last_kills = 0
         self.kill_milestones = [5, 10, 15]
         self.triggered_milestones = set()
     def reset(self):
-        self.last_kills = 0
         self.triggered_milestones.clear()
-    def check(self, current_data, previous_data):
+    def check_stats(self, deltas, current_data, previous_data):
         kills = current_data.get("kills", 0)
         your_name = current_data.get("your_name", "")
         messages = []
         # Basic kill delta
-        if kills > self.last_kills:
-            diff = kills - self.last_kills
+        diff = deltas.get("kills", 0)
+        if diff > 0:
             kill_lines = [
                 f"⚔️ {your_name} just secured {diff} kill{'s' if diff > 1 else ''}! Keep snowballing!",
                 f"💀 {your_name} added {diff} more to the tally.",
                 f"🔥 {your_name} is racking up kills — {diff} just now!"
             ]
             messages.append(random.choice(kill_lines))
-            self.last_kills = kills
         # Check kill milestones
         for milestone in self.kill_milestones:
             if kills >= milestone and milestone not in self.triggered_milestones:
@@ -94,12 +113,12 @@ class KillCountTrigger(GameTrigger):
                     lines = [
                         f"💥 {your_name} hit 5 kills! Poppin’ off!",
                         f"⚡ {your_name} is on a hot streak — 5 kills!",
-                    ],
+                    ]
                 elif milestone == 10:
                     lines = [
                         f"💣 Double digits! {your_name} just hit 10 kills!",
                         f"🎯 {your_name} is carrying — 10 takedowns in!",
-                    ],
+                    ]
                 elif milestone == 15:
                     lines = [
                         f"👑 {your_name} is UNSTOPPABLE — 15 kills now!",
@@ -111,16 +130,11 @@ class KillCountTrigger(GameTrigger):
 
 class DeathTrigger(GameTrigger):
     """Trigger when player dies (death count increases)."""
-    def __init__(self):
-        self.last_deaths = 0
-    def reset(self):
-        self.last_deaths = 0
-    def check(self, current_data, previous_data):
+    stat_keys = ("deaths",)
+    def check_stats(self, deltas, current_data, previous_data):
         deaths = current_data.get("deaths", 0)
         your_name = current_data.get("your_name", "")
-        if deaths > self.last_deaths:
-            diff = deaths - self.last_deaths
-            self.last_deaths = deaths
+        if deltas.get("deaths", 0) > 0:
             death_lines = [
                 f"☠️ {your_name} went down again. Total deaths: {deaths}.",
                 f"📉 That’s {your_name}'s {deaths} death... stay safe!",
@@ -131,7 +145,7 @@ class DeathTrigger(GameTrigger):
             return random.choice(death_lines)
         return None
 
-class GoldThresholdTrigger:
+class GoldThresholdTrigger(GameTrigger):
     def __init__(self, cooldown=300):  # default 5 minutes
         self.cooldown = cooldown
         self.last_triggered = 0  # store timestamp of last trigger
@@ -154,122 +168,99 @@ class GoldThresholdTrigger:
         return None
 
 class FirstBloodTrigger(GameTrigger):
+    event_names = ("ChampionKill",)
     def __init__(self):
         self.triggered = False
     def reset(self):
         self.triggered = False
-    def check(self, current, previous):
+    def check_events(self, events, current, previous):
         if self.triggered:
             return None
-        events = current.get("events", {}).get("Events", [])
         your_name = current.get("your_name", "")
         your_team = current.get("your_team", "ORDER")
-        all_players = current.get("allPlayers", [])
+        roster = get_roster(current)
         for event in events:
-            if event.get("EventName") == "ChampionKill":
-                killer = event.get("KillerName", "")
-                victim = event.get("VictimName", "")
-                killer_player = next((p for p in all_players if p.get("summonerName") == killer), None)
-                if not killer_player:
-                    continue  # skip unknown killer
-                killer_team = killer_player.get("team", "UNKNOWN")
-                self.triggered = True  # ✅ Mark as triggered
-                if killer == your_name:
-                    return f"🩸 First Blood is yours! You just took down {victim} — what a start!"
-                elif killer_team == your_team:
-                    return f"💥 First Blood for your team! {killer} struck first and got {victim}!"
-                else:
-                    return f"⚠️ First Blood goes to the enemy! {killer} eliminated {victim} early!"
+            killer = event.get("KillerName", "")
+            victim = event.get("VictimName", "")
+            killer_team = roster.team_of(killer)
+            if not killer_team:
+                continue  # skip unknown killer
+            self.triggered = True  # ✅ Mark as triggered
+            if killer == your_name:
+                return f"🩸 First Blood is yours! You just took down {victim} — what a start!"
+            elif killer_team == your_team:
+                return f"💥 First Blood for your team! {killer} struck first and got {victim}!"
+            else:
+                return f"⚠️ First Blood goes to the enemy! {killer} eliminated {victim} early!"
         return None
 
-class DragonKillTrigger:
+class DragonKillTrigger(GameTrigger):
+    event_names = ("DragonKill",)
     def __init__(self):
-        self.last_event_time = 0
         self.last_dragon_kills = {"ORDER": 0, "CHAOS": 0}
     def reset(self):
-        self.last_event_time = 0
         self.last_dragon_kills = {"ORDER": 0, "CHAOS": 0}
-    def check(self, current, previous):
-        events = current.get("events", {}).get("Events", [])
+    def check_events(self, events, current, previous):
         your_team = current.get("your_team", "ORDER")
-        all_players = current.get("allPlayers", [])
-        for event in reversed(events):
-            if event.get("EventName") != "DragonKill":
-                continue
-            event_time = event.get("EventTime", 0)
-            if event_time <= self.last_event_time:
-                continue
-            self.last_event_time = event_time
-            dragon_type = event.get("DragonType", "Unknown")
-            is_stolen = event.get("Stolen", "False") == "True"
-            killer_name = event.get("KillerName", "")
-            killer_player = next((p for p in all_players if p.get("summonerName") == killer_name), None)
-            if not killer_player:
+        roster = get_roster(current)
+        message = None
+        for event in events:
+            team = roster.team_of(event.get("KillerName", ""))
+            if not team:
                 continue
-            team = killer_player.get("team", "UNKNOWN")
             self.last_dragon_kills[team] = self.last_dragon_kills.get(team, 0) + 1
-            dragon_count = self.last_dragon_kills[team]
-            # 🎯 Elder dragon (high priority)
-            if dragon_type == "Elder":
-                if team == your_team:
-                    return "🌟 Elder Dragon secured! Your team just got a major buff!"
-                else:
-                    return "💀 The enemy team got Elder Dragon! This could swing the game!"
-            # 🎯 Dragon steal
-            if is_stolen:
-                if team == your_team:
-                    return f"😎 You stole the {dragon_type} dragon right under their noses!"
-                else:
-                    return f"⚠️ The enemy team **stole** the {dragon_type} dragon!"
-            # 🎯 Dragon Soul logic
-            if dragon_count == 4:
-                if team == your_team:
-                    return f"🔥 Your team has taken their 4th dragon — Dragon Soul unlocked!"
-                else:
-                    return f"🚨 Enemy team now has the Dragon Soul. Be very careful!"
-            # 🎯 Dragon point logic (3rd dragon)
-            if dragon_count == 3:
-                if team == your_team:
-                    return f"⏳ That’s your 3rd dragon — one more to soul!"
-                else:
-                    return f"⚠️ Enemy team just got their 3rd dragon — one more for soul!"
-            # 🎯 Default messaging
+            message = self._message_for_dragon(event, team, self.last_dragon_kills[team], your_team)
+        return message  # Only the most recent dragon is announced
+    def _message_for_dragon(self, event, team, dragon_count, your_team):
+        dragon_type = event.get("DragonType", "Unknown")
+        is_stolen = event.get("Stolen", "False") == "True"
+        # 🎯 Elder dragon (high priority)
+        if dragon_type == "Elder":
             if team == your_team:
-                return f"🐉 Your team took the {dragon_type} dragon!"
+                return "🌟 Elder Dragon secured! Your team just got a major buff!"
             else:
-                return f"⚠️ Enemy team took the {dragon_type} dragon!"
-        return None
+                return "💀 The enemy team got Elder Dragon! This could swing the game!"
+        # 🎯 Dragon steal
+        if is_stolen:
+            if team == your_team:
+                return f"😎 You stole the {dragon_type} dragon right under their noses!"
+            else:
+                return f"⚠️ The enemy team **stole** the {dragon_type} dragon!"
+        # 🎯 Dragon Soul logic
+        if dragon_count == 4:
+            if team == your_team:
+                return f"🔥 Your team has taken their 4th dragon — Dragon Soul unlocked!"
+            else:
+                return f"🚨 Enemy team now has the Dragon Soul. Be very careful!"
+        # 🎯 Dragon point logic (3rd dragon)
+        if dragon_count == 3:
+            if team == your_team:
+                return f"⏳ That’s your 3rd dragon — one more to soul!"
+            else:
+                return f"⚠️ Enemy team just got their 3rd dragon — one more for soul!"
+        # 🎯 Default messaging
+        if team == your_team:
+            return f"🐉 Your team took the {dragon_type} dragon!"
+        else:
+            return f"⚠️ Enemy team took the {dragon_type} dragon!"
 
 
 class MultikillEventTrigger(GameTrigger):
+    event_names = ("Multikill",)
     def __init__(self, your_name: str, your_team: str = None):
         self.your_name = your_name
         self.your_team = your_team
-        self.last_seen_event_ids = set()  # ✅ Track handled EventIDs
-    def reset(self):
-        self.last_seen_event_ids.clear()
-    def check(self, current_data, previous_data):
-        events = current_data.get("events", {}).get("Events", [])
-        all_players = current_data.get("allPlayers", [])
+    def check_events(self, events, current_data, previous_data):
+        roster = get_roster(current_data)
         your_team = self.your_team or current_data.get("your_team", "ORDER")
         for event in reversed(events):
-            if event.get("EventName") != "Multikill":
-                continue
-            event_id = event.get("EventID")
-            if not event_id or event_id in self.last_seen_event_ids:
-                continue  # ✅ Already seen or missing ID
-            self.last_seen_event_ids.add(event_id)  # ✅ Mark as seen
-            # ✅ Memory cleanup: trim if too large
-            if len(self.last_seen_event_ids) > 100:
-                self.last_seen_event_ids = set(list(self.last_seen_event_ids)[-50:])
             killer = event.get("KillerName")
             streak = event.get("KillStreak", 2)
             if not killer:
                 continue
-            killer_player = next((p for p in all_players if p.get("summonerName") == killer), None)
-            if not killer_player:
+            team = roster.team_of(killer)
+            if not team:
                 continue
-            team = killer_player.get("team", "UNKNOWN")
             if killer == self.your_name:
                 return self._message_for_streak(streak, "self")
             elif team == your_team:
@@ -294,16 +285,16 @@ class MultikillEventTrigger(GameTrigger):
 
 class GameEndTrigger(GameTrigger):
     """Trigger at end of game with win/loss recap."""
+    event_names = ("GameEnd",)
     def __init__(self):
         self.triggered = False
         self.result = None
     def reset(self):
         self.triggered = False
         self.result = None
-    def check(self, current_data, previous_data):
+    def check_events(self, events, current_data, previous_data):
         if self.triggered:
             return None
-        events = current_data.get("events", {}).get("Events", [])
         for event in reversed(events):
             if event.get("EventName") == "GameEnd":
                 self.triggered = True
@@ -356,20 +347,10 @@ class GoldDifferenceTrigger(GameTrigger):
 
 
 class AceTrigger(GameTrigger):
-    def __init__(self):
-        self.last_ace_time = 0
-    def reset(self):
-        self.last_ace_time = 0
-    def check(self, current, previous):
-        events = current.get("events", {}).get("Events", [])
+    event_names = ("Ace",)
+    def check_events(self, events, current, previous):
         your_team = current.get("your_team", "ORDER")
         for event in reversed(events):
-            if event.get("EventName") != "Ace":
-                continue
-            event_time = event.get("EventTime", 0)
-            if event_time <= self.last_ace_time:
-                continue
-            self.last_ace_time = event_time
             acing_team = event.get("AcingTeam", "UNKNOWN")
             if acing_team == your_team:
                 return "🔥 ACE! Your team just wiped them out!"
@@ -378,27 +359,16 @@ class AceTrigger(GameTrigger):
         return None
 
 class BaronTrigger(GameTrigger):
-    def __init__(self):
-        self.last_event_time = 0
-    def reset(self):
-        self.last_event_time = 0
-    def check(self, current, previous):
-        events = current.get("events", {}).get("Events", [])
+    event_names = ("BaronKill",)
+    def check_events(self, events, current, previous):
         your_team = current.get("your_team", "ORDER")
-        all_players = current.get("allPlayers", []) 
+        roster = get_roster(current)
         for event in reversed(events):
-            if event.get("EventName") != "BaronKill":
-                continue
-            event_time = event.get("EventTime", 0)
-            if event_time <= self.last_event_time:
-                continue
-            self.last_event_time = event_time
             killer_name = event.get("KillerName", "")
             is_stolen = event.get("Stolen", "False") == "True"
-            killer_player = next((p for p in all_players if p.get("summonerName") == killer_name), None)
-            if not killer_player:
+            team = roster.team_of(killer_name)
+            if not team:
                 continue
-            team = killer_player.get("team", "UNKNOWN")
             if is_stolen:
                 if team == your_team:
                     return "🛑 Incredible! Your team **stole** Baron Nashor!"
@@ -411,26 +381,15 @@ class BaronTrigger(GameTrigger):
         return None
 
 class AtakhanKillTrigger(GameTrigger):
-    def __init__(self):
-        self.last_event_time = 0
-    def reset(self):
-        self.last_event_time = 0
-    def check(self, current, previous):
-        events = current.get("events", {}).get("Events", [])
+    event_names = ("AtakhanKill",)
+    def check_events(self, events, current, previous):
         your_team = current.get("your_team", "ORDER")
-        all_players = current.get("allPlayers", [])
+        roster = get_roster(current)
         for event in reversed(events):
-            if event.get("EventName") != "AtakhanKill":
-                continue
-            event_time = event.get("EventTime", 0)
-            if event_time <= self.last_event_time:
-                continue
-            self.last_event_time = event_time
             killer_name = event.get("KillerName", "")
-            killer_player = next((p for p in all_players if p.get("summonerName") == killer_name), None)
-            if not killer_player:
+            team = roster.team_of(killer_name)
+            if not team:
                 continue
-            team = killer_player.get("team", "UNKNOWN")
             if team == your_team:
                 return "🌌 Your team has slain **Atakhan**, the Void King! Huge power spike!"
             else:
@@ -438,26 +397,15 @@ class AtakhanKillTrigger(GameTrigger):
         return None
 
 class HeraldKillTrigger(GameTrigger):
-    def __init__(self):
-        self.last_event_time = 0
-    def reset(self):
-        self.last_event_time = 0
-    def check(self, current, previous):
-        events = current.get("events", {}).get("Events", [])
+    event_names = ("HeraldKill",)
+    def check_events(self, events, current, previous):
         your_team = current.get("your_team", "ORDER")
-        all_players = current.get("allPlayers", [])
+        roster = get_roster(current)
         for event in reversed(events):
-            if event.get("EventName") != "HeraldKill":
-                continue
-            event_time = event.get("EventTime", 0)
-            if event_time <= self.last_event_time:
-                continue
-            self.last_event_time = event_time
             killer_name = event.get("KillerName", "")
-            killer_player = next((p for p in all_players if p.get("summonerName") == killer_name), None)
-            if not killer_player:
+            team = roster.team_of(killer_name)
+            if not team:
                 continue
-            team = killer_player.get("team", "UNKNOWN")
             if team == your_team:
                 return "💪 Your team secured the Rift Herald!"
             else:
@@ -465,10 +413,10 @@ class HeraldKillTrigger(GameTrigger):
         return None
 
 class FeatsOfStrengthTrigger(GameTrigger):
+    event_names = ("ChampionKill", "FirstBrick", "HeraldKill", "BaronKill", "AtakhanKill", "HordeKill", "DragonKill")
     def __init__(self):
         self.triggered = False
         self.triggered_team = None
-        self.seen_event_ids = set()
         self.team_kills = defaultdict(int)
         self.first_brick_claimed = {}
         self.voidgrub_sets_checked = 0
@@ -483,7 +431,6 @@ class FeatsOfStrengthTrigger(GameTrigger):
     def reset(self):
         self.triggered = False
         self.triggered_team = None
-        self.seen_event_ids.clear()
         self.team_kills.clear()
         self.first_brick_claimed.clear()
         self.voidgrub_sets_checked = 0
@@ -497,11 +444,10 @@ class FeatsOfStrengthTrigger(GameTrigger):
         }
     def get_triggered_team(self):
         return self.triggered_team if self.triggered else None
-    def check(self, current, previous):
+    def check_events(self, events, current, previous):
         if self.triggered:
             return None
-        events = current.get("events", {}).get("Events", [])
-        all_players = current.get("allPlayers", [])
+        roster = get_roster(current)
         your_team = current.get("your_team", "ORDER")
         # ✅ Load persistent DragonKill count
         for team_name, count in current.get("dragon_kills", {}).items():
@@ -509,19 +455,13 @@ class FeatsOfStrengthTrigger(GameTrigger):
                 self.team_objectives[team_name]["DragonKill"] = count
         team_progress = {}
         for event in events:
-            event_id = event.get("EventID")
-            if not event_id or event_id in self.seen_event_ids:
-                continue
-            self.seen_event_ids.add(event_id)
+            if event["EventName"] == "DragonKill":
+                continue  # Dragons are counted from current["dragon_kills"] above
             killer_name = event.get("KillerName", "")
-            killer_player = next((p for p in all_players if p.get("summonerName") == killer_name), None)
-            team = killer_player.get("team", "UNKNOWN") if killer_player else None
+            team = roster.team_of(killer_name)
             # Special case: Minion first brick
-            if event["EventName"] == "FirstBrick" and not killer_player:
-                if killer_name.startswith("Minion_T100"):
-                    team = "ORDER"
-                elif killer_name.startswith("Minion_T200"):
-                    team = "CHAOS"
+            if event["EventName"] == "FirstBrick" and not team:
+                team = roster.team_of_killer(killer_name)
                 if team:
                     self.first_brick_claimed[team] = True  # ✅ persist it
             if not team:
@@ -602,8 +542,6 @@ class FeatsOfStrengthTrigger(GameTrigger):
                     return "⚠️ Enemy team just pulled off a Feats of Strength — they’re taking control!"
         return None
     def _add_horde_kill(self, event, team):
-        if any(e["EventID"] == event["EventID"] for e in self.horde_kill_buffer):
-            return
         self.horde_kill_buffer.append({
             "event_time": event.get("EventTime", 0),
             "team": team,
@@ -611,29 +549,26 @@ class FeatsOfStrengthTrigger(GameTrigger):
         })
 
 class StreakTrigger(GameTrigger):
+    event_names = ("ChampionKill",)
     def __init__(self):
         self.streaks = defaultdict(int)
         self.last_killed_by = {}
         self.shutdowns = set()
-        self.processed_event_ids = set()
     def reset(self):
         self.streaks.clear()
         self.last_killed_by.clear()
         self.shutdowns.clear()
-        self.processed_event_ids.clear()
     def get_player_streak(self, player_name):
         return self.streaks.get(player_name, 0)
-    def check(self, current, previous):
+    def check_events(self, events, current, previous):
         messages = []
-        events = current.get("events", {}).get("Events", [])
-        all_players = current.get("allPlayers", [])
+        roster = get_roster(current)
         your_team = current.get("your_team", "ORDER")
         your_name = current.get("your_name", "")
-        name_to_team = {p.get("summonerName"): p.get("team") for p in all_players}
         def perspective(name):
             if name == your_name:
                 return "self"
-            elif name_to_team.get(name) == your_team:
+            elif roster.team_of(name) == your_team:
                 return "ally"
             else:
                 return "enemy"
@@ -643,12 +578,6 @@ class StreakTrigger(GameTrigger):
             "enemy": "⚠️"
         }
         for event in events:
-            if event.get("EventName") != "ChampionKill":
-                continue
-            event_id = event.get("EventID")
-            if event_id in self.processed_event_ids:
-                continue
-            self.processed_event_ids.add(event_id)
             killer = event.get("KillerName")
             victim = event.get("VictimName")
             if not killer or not victim:
@@ -0,0 +1,89 @@
+# tts_cache.py
+import hashlib
+import json
+import os
+import threading
+
+TTS_CACHE_DIR = "./tts_cache"
+TTS_CACHE_MAX_BYTES = 200 * 1024 * 1024  # 200 MB of clips on disk
+
+def _settings_dict(voice_settings):
+    if voice_settings is None:
+        return None
+    if hasattr(voice_settings, "model_dump"):
+        return voice_settings.model_dump()
+    if hasattr(voice_settings, "dict"):
+        return voice_settings.dict()
+    return repr(voice_settings)
+
+class TTSAudioCache:
+    """
+    Content-addressed cache of synthesized clips.
+    A clip's key is the hash of (text, voice_id, model, voice settings), so any change
+    to the voice produces a new entry. Hits refresh the file's mtime; once the folder
+    grows past `max_bytes` the least recently used clips are deleted.
+    """
+    def __init__(self, cache_dir=TTS_CACHE_DIR, max_bytes=TTS_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, text, voice_id, model, voice_settings):
+        payload = json.dumps([text, voice_id, model, _settings_dict(voice_settings)], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.mp3")
+
+    def get(self, key):
+        """Cached clip bytes, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return audio
+
+    def put(self, key, audio):
+        if not audio:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ [TTSCache] Failed to store clip: {e}")
+            return
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.cache_dir):
+                if entry.is_file() and entry.name.endswith(".mp3"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+            if total <= self.max_bytes:
+                return
+            for _, size, path in sorted(entries):
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,159 @@
+# tts_engine.py
+import concurrent.futures
+import queue
+import re
+import shutil
+import subprocess
+import time
+from elevenlabs import play
+from log_utils import log_error, log_event
+from tts_cache import TTSAudioCache
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?…])\s+")
+MIN_SENTENCE_CHARS = 40  # Shorter sentences are merged into the next one so each request carries enough text
+SYNTH_WORKERS = 2  # Current line + the prefetched next one
+MPV_COMMAND = ["mpv", "--no-cache", "--no-terminal", "--really-quiet", "--", "fd://0"]
+_END = object()
+
+def split_sentences(text):
+    """Split text into sentence-sized pieces (short ones merged) for pipelined synthesis."""
+    pieces = []
+    current = ""
+    for sentence in SENTENCE_BOUNDARY.split(text.strip()):
+        current = f"{current} {sentence}".strip()
+        if len(current) >= MIN_SENTENCE_CHARS:
+            pieces.append(current)
+            current = ""
+    if current:
+        pieces.append(current)
+    return pieces
+
+class Utterance:
+    """One line of speech. Synthesized audio chunks land in `chunks` as soon as they arrive."""
+    def __init__(self, text, voice_id, offline=False):
+        self.text = text
+        self.voice_id = voice_id
+        self.offline = offline
+        self.cache_key = None
+        self.cached = False
+        self.chunks = queue.Queue()
+        self.error = None
+        self.requested_at = time.perf_counter()
+        self.first_chunk_at = None
+
+    def stream(self):
+        while True:
+            chunk = self.chunks.get()
+            if chunk is _END:
+                return
+            yield chunk
+
+class StreamingTTSEngine:
+    """
+    Streaming ElevenLabs playback.
+    prepare() starts synthesis (or the cache lookup) right away on a synth thread, sentence by sentence,
+    so the next queued line can be synthesized while the current one plays.
+    play() (blocking, run it on the playback executor) pipes chunks into mpv as they
+    arrive; without mpv it buffers the clip for elevenlabs.play. If nothing could be
+    synthesized it falls back to the offline voice.
+    Finished clips are kept in a TTSAudioCache, so repeated lines play without a network round trip.
+    """
+    def __init__(self, client, model, voice_settings, fallback, enabled=True, cache=None):
+        self.client = client
+        self.model = model
+        self.voice_settings = voice_settings
+        self.fallback = fallback
+        self.enabled = enabled
+        self.cache = cache if cache is not None else TTSAudioCache()
+        self.player = shutil.which("mpv")
+        self.synth_executor = concurrent.futures.ThreadPoolExecutor(max_workers=SYNTH_WORKERS, thread_name_prefix="tts-synth")
+        if enabled and not self.player:
+            print("⚠️ [TTS] mpv not found — ElevenLabs clips will be buffered before playback.")
+
+    def prepare(self, text, voice_id):
+        utterance = Utterance(text, voice_id, offline=not self.enabled)
+        if not self.enabled:
+            return utterance
+        utterance.cache_key = self.cache.key(text, voice_id, self.model, self.voice_settings)
+        self.synth_executor.submit(self._synthesize, utterance)
+        return utterance
+
+    def _synthesize(self, utterance):
+        clip = []
+        try:
+            # Runs on a synth thread, so the cache's file read stays off the event loop
+            audio = self.cache.get(utterance.cache_key)
+            if audio:
+                utterance.cached = True
+                utterance.first_chunk_at = time.perf_counter()
+                utterance.chunks.put(audio)
+                return
+            for sentence in split_sentences(utterance.text):
+                audio = self.client.generate(
+                    text=sentence,
+                    voice=utterance.voice_id,
+                    model=self.model,
+                    voice_settings=self.voice_settings,
+                    stream=True
+                )
+                for chunk in audio:
+                    if not chunk:
+                        continue
+                    if utterance.first_chunk_at is None:
+                        utterance.first_chunk_at = time.perf_counter()
+                    utterance.chunks.put(chunk)
+                    clip.append(chunk)
+        except Exception as e:
+            utterance.error = e
+        finally:
+            utterance.chunks.put(_END)
+        if clip and utterance.error is None:
+            self.cache.put(utterance.cache_key, b"".join(clip))
+
+    def play(self, utterance):
+        if utterance.offline:
+            self.fallback(utterance.text)
+            return
+        play_start = time.perf_counter()
+        chunks = utterance.stream()
+        first = next(chunks, None)
+        if first is None:
+            log_error(f"[TTS FALLBACK] ElevenLabs failed, falling back to pyttsx3. Reason: {utterance.error}")
+            self.fallback(utterance.text)
+            return
+        self._log_first_audio(utterance, play_start)
+        if self.player:
+            self._pipe_to_player(first, chunks)
+        else:
+            play(first + b"".join(chunks))
+        if utterance.error:
+            log_error(f"[TTS] ElevenLabs stream cut off mid-line: {utterance.error}")
+
+    def _pipe_to_player(self, first, chunks):
+        process = subprocess.Popen(MPV_COMMAND, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            process.stdin.write(first)
+            process.stdin.flush()
+            for chunk in chunks:
+                process.stdin.write(chunk)
+                process.stdin.flush()
+        except BrokenPipeError:
+            log_error("[TTS] mpv closed the audio pipe early.")
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+            process.wait()
+
+    def _log_first_audio(self, utterance, play_start):
+        now = time.perf_counter()
+        synth_ms = (utterance.first_chunk_at - utterance.requested_at) * 1000
+        message = (f"[TTS] First audio {(now - play_start) * 1000:.0f} ms after playback start "
+                   f"(first chunk {synth_ms:.0f} ms after request) | {len(utterance.text)} chars"
+                   f"{' | cached' if utterance.cached else ''}")
+        print(f"🔊 {message}")
+        log_event(message, filename="tts_timings.log")
+
+    def shutdown(self):
+        self.synth_executor.shutdown(wait=False, cancel_futures=True)
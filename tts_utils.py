@@ -1,8 +1,11 @@
 import asyncio
 import pyttsx3
 import concurrent.futures
+import queue
+import threading
+import time
 from datetime import datetime, timezone
-from log_utils import log_error
+from log_utils import log_error, log_event
 
 # TTS Configuration
 tts_lock = asyncio.Lock()
@@ -11,16 +14,144 @@ tts_queue = asyncio.Queue()
 MAX_TTS_QUEUE_SIZE = 10  # Prevents spam/flood
 ASKAI_TTS_RESERVED_LIMIT = 7  # Maximum messages askai is allowed to use in TTS queue
 EVENTSUB_RESERVED_SLOTS = MAX_TTS_QUEUE_SIZE - ASKAI_TTS_RESERVED_LIMIT
+OFFLINE_SPEECH_RATE = 160
+OFFLINE_SPEECH_TIMEOUT = 90  # Seconds speak() waits for a line before giving up on the engine
+
+class SpeechRequest:
+    def __init__(self, text):
+        self.text = text
+        self.skipped = False
+        self.done = threading.Event()
+        self.error = None
+        self.queued_at = time.perf_counter()
+        self.started_at = None
+
+class OfflineSpeechService:
+    """
+    Long-lived pyttsx3 voice.
+    One engine is created once on a dedicated thread and fed through a queue, so
+    lines don't pay for a driver/voice reload. skip() stops the current line,
+    interrupt() also drops everything still queued.
+    If the engine can't be created, every queued line fails with that error instead of
+    waiting on a voice that never comes; the next speak() tries again.
+    """
+    def __init__(self, rate=OFFLINE_SPEECH_RATE):
+        self.rate = rate
+        self.requests = queue.Queue()
+        self._thread = None
+        self._engine = None
+        self._current = None
+        self._stop_requested = False
+        self._lock = threading.Lock()
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="OfflineSpeech", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            self._engine = pyttsx3.init()
+            self._engine.setProperty('rate', self.rate)
+            self._engine.connect('started-utterance', self._on_started)
+            self._engine.connect('started-word', self._on_word)
+        except Exception as e:
+            log_error(f"[OfflineSpeech ERROR] pyttsx3 engine failed to start: {e}")
+            self._engine = None
+            self._fail_pending(e)
+            return
+        print(f"🗣️ [OfflineSpeech] pyttsx3 engine ready in {(time.perf_counter() - start) * 1000:.0f} ms")
+        while True:
+            request = self.requests.get()
+            if request is None:
+                break
+            if not request.skipped:
+                self._speak(request)
+            request.done.set()
+
+    def _fail_pending(self, error):
+        while True:
+            try:
+                request = self.requests.get_nowait()
+            except queue.Empty:
+                return
+            if request is not None:
+                request.error = error
+                request.done.set()
+
+    def _speak(self, request):
+        self._current = request
+        self._stop_requested = False
+        begin = time.perf_counter()
+        try:
+            self._engine.say(request.text)
+            self._engine.runAndWait()
+        except Exception as e:
+            log_error(f"[OfflineSpeech ERROR] {e}")
+        finally:
+            self._current = None
+        end = time.perf_counter()
+        started = request.started_at or end
+        message = (f"[OfflineSpeech] Started {(started - begin) * 1000:.0f} ms after dequeue "
+                   f"(waited {(begin - request.queued_at) * 1000:.0f} ms in queue), "
+                   f"spoke for {(end - started):.2f}s{' | skipped' if self._stop_requested else ''}")
+        print(f"🗣️ {message}")
+        log_event(message, filename="tts_timings.log")
+
+    def _on_started(self, name):
+        if self._current:
+            self._current.started_at = time.perf_counter()
+
+    def _on_word(self, name, location, length):
+        # pyttsx3 only allows stop() from inside the engine's own loop
+        if self._stop_requested:
+            self._engine.stop()
+
+    def speak(self, text, wait=True):
+        """
+        Queue a line; blocks until it has been spoken (or skipped) unless wait=False.
+        Raises the engine's error if it couldn't start, or TimeoutError after OFFLINE_SPEECH_TIMEOUT.
+        """
+        request = SpeechRequest(text)
+        self.requests.put(request)
+        self._ensure_thread()
+        if wait:
+            if not request.done.wait(OFFLINE_SPEECH_TIMEOUT):
+                request.skipped = True
+                if self._current is request:
+                    self.skip()
+                raise TimeoutError(f"Offline speech did not finish within {OFFLINE_SPEECH_TIMEOUT}s")
+            if request.error:
+                raise request.error
+        return request
+
+    def skip(self):
+        """Stop the line currently being spoken."""
+        if self._current:
+            self._stop_requested = True
+
+    def interrupt(self):
+        """Stop the current line and drop everything still queued."""
+        with self.requests.mutex:
+            for request in self.requests.queue:
+                if request is not None:
+                    request.skipped = True
+        self.skip()
+
+    def shutdown(self):
+        self.interrupt()
+        self.requests.put(None)
+
+offline_speech = OfflineSpeechService()
 
 async def speak_text(text):
     loop = asyncio.get_running_loop()
     await loop.run_in_executor(tts_executor, speak_sync, text)
 
 def speak_sync(text):
-    engine = pyttsx3.init()
-    engine.setProperty('rate', 160)
-    engine.say(text)
-    engine.runAndWait()
+    offline_speech.speak(text)
 
 async def tts_worker(bot_instance=None):
     while True:
@@ -51,6 +182,7 @@ async def safe_add_to_tts_queue(item):
 
 def shutdown_tts_executor():
     try:
+        offline_speech.shutdown()
         tts_executor.shutdown(wait=False)
         print("✅ TTS executor shutdown complete.")
     except Exception as e:
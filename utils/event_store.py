@@ -0,0 +1,111 @@
+# utils/event_store.py
+
+INHIB_RESPAWN_SECONDS = 300  # 5 minutes
+BARON_BUFF_SECONDS = 180  # 3 minutes
+ELDER_BUFF_SECONDS = 150  # 2.5 minutes
+TEAMS = ("ORDER", "CHAOS")
+
+class GameEventStore:
+    """
+    Per-game store for Live Client events.
+    Only events with an EventID above the last one seen are ingested, and the
+    per-team objective aggregates are updated as they arrive, so a poll costs
+    O(new events) instead of rescanning the whole match history.
+    """
+    def __init__(self):
+        self.events = []
+        self.last_event_id = -1
+        self.dragon_kills = {}
+        self.heralds = {}
+        self.void_grubs = {}
+        self.atakhan_kills = {}
+        self.towers = {}
+        self.inhib_respawn_timer = {"ORDER": [], "CHAOS": []}
+        self.baron_expire = {}
+        self.elder_expire = {}
+        self.reset()
+
+    def reset(self):
+        """Forget the current game. Clears in place so shared references stay valid."""
+        self.events.clear()
+        self.last_event_id = -1
+        for counter in (self.dragon_kills, self.heralds, self.void_grubs, self.atakhan_kills):
+            counter.clear()
+            counter.update({team: 0 for team in TEAMS})
+        self.towers.clear()
+        self.towers.update({team: {"tier1": 0, "tier2": 0, "tier3": 0} for team in TEAMS})
+        for timers in self.inhib_respawn_timer.values():
+            timers.clear()
+        self.baron_expire.clear()
+        self.elder_expire.clear()
+
+    def _resume_index(self, events):
+        # Live Client always returns the full history in EventID order, so the
+        # events we already hold are a prefix of the new list.
+        seen = len(self.events)
+        if seen and len(events) >= seen and events[seen - 1].get("EventID") == self.last_event_id:
+            return seen
+        return 0
+
+    def ingest(self, events, team_of):
+        """
+        Ingest the events list from allgamedata and return only the new ones.
+        `team_of` maps a KillerName to "ORDER"/"CHAOS" (or None if unknown).
+        """
+        if events and self.last_event_id >= 0 and events[-1].get("EventID", -1) < self.last_event_id:
+            print("🔁 [EventStore] EventIDs went backwards — new game, resetting store.")
+            self.reset()
+        new_events = []
+        for event in events[self._resume_index(events):]:
+            event_id = event.get("EventID")
+            if event_id is None or event_id <= self.last_event_id:
+                continue
+            self.last_event_id = event_id
+            self.events.append(event)
+            new_events.append(event)
+            self._apply(event, team_of)
+        return new_events
+
+    def _apply(self, event, team_of):
+        name = event.get("EventName")
+        if name not in ("DragonKill", "InhibKilled", "BaronKill", "ElderKill",
+                        "HeraldKill", "AtakhanKill", "HordeKill", "TurretKilled"):
+            return
+        team = team_of(event.get("KillerName", ""))
+        if not team:
+            return
+        if name == "DragonKill":
+            self.dragon_kills[team] = self.dragon_kills.get(team, 0) + 1
+        elif name == "InhibKilled":
+            self.inhib_respawn_timer.setdefault(team, []).append(event["EventTime"] + INHIB_RESPAWN_SECONDS)
+        elif name == "BaronKill":
+            self.baron_expire[team] = event["EventTime"] + BARON_BUFF_SECONDS
+        elif name == "ElderKill":
+            self.elder_expire[team] = event["EventTime"] + ELDER_BUFF_SECONDS
+        elif name == "HeraldKill":
+            self.heralds[team] = self.heralds.get(team, 0) + 1
+        elif name == "AtakhanKill":
+            self.atakhan_kills[team] = self.atakhan_kills.get(team, 0) + 1
+        elif name == "HordeKill":
+            self.void_grubs[team] = self.void_grubs.get(team, 0) + 1
+        elif name == "TurretKilled":
+            turret = event.get("TurretKilled", "")
+            towers = self.towers.setdefault(team, {"tier1": 0, "tier2": 0, "tier3": 0})
+            for tier, tag in (("tier1", "T1"), ("tier2", "T2"), ("tier3", "T3")):
+                if tag in turret:
+                    towers[tier] += 1
+
+    def team_data(self, team, game_time_seconds):
+        """Objective summary for one team, in the shape power_score() expects."""
+        atakhan = self.atakhan_kills.get(team, 0)
+        return {
+            "dragons": self.dragon_kills.get(team, 0),
+            "elder_dragon": self.elder_expire.get(team, 0) > game_time_seconds,
+            "baron_buff": self.baron_expire.get(team, 0) > game_time_seconds,
+            "heralds": self.heralds.get(team, 0),
+            "atakan_buff": atakhan > 0,
+            "atakan_temp": atakhan,
+            "void_grubs": self.void_grubs.get(team, 0),
+            "towers": dict(self.towers.get(team, {"tier1": 0, "tier2": 0, "tier3": 0})),
+            "inhibitors_down": sum(1 for t in self.inhib_respawn_timer.get(team, []) if t > game_time_seconds)
+        }
@@ -1,57 +1,59 @@
 # utils/game_utils.py
-import os
-import json
-import requests
 from collections import Counter
+import numpy as np
+from utils.item_catalog import load_item_catalog, local_ddragon_versions, match_patch
 
-ITEM_CACHE_FILE = "cached_item_prices.json"
-ITEM_PRICES = None
-
-def load_item_prices():
-    url = "https://ddragon.leagueoflegends.com/cdn/15.7.1/data/en_US/item.json"
-    import requests
-    response = requests.get(url)
-    data = response.json()
-    prices = {int(k): v["gold"]["total"] for k, v in data["data"].items()}
-    with open(ITEM_CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(prices, f)
-    return prices
-
-def load_item_prices_from_cache():
-    try:
-        if os.path.exists(ITEM_CACHE_FILE):
-            with open(ITEM_CACHE_FILE, "r", encoding="utf-8") as f:
-                return {int(k): v for k, v in json.load(f).items()}
-    except Exception as e:
-        print("[ItemCache] Failed to load item cache:", e)
-    return None
+ITEM_PRICES = None  # ItemCatalog for the current patch (dict-like .get for single lookups)
+_last_game_version = None
 
 def ensure_item_prices_loaded():
     global ITEM_PRICES
     if ITEM_PRICES is None:
-        ITEM_PRICES = load_item_prices_from_cache() or load_item_prices()
+        ITEM_PRICES = load_item_catalog()
     return ITEM_PRICES
 
+def use_game_version(game_version):
+    """Switch to the local Data Dragon snapshot matching the Live Client's gameVersion, if there is one."""
+    global ITEM_PRICES, _last_game_version
+    if game_version == _last_game_version:
+        return ensure_item_prices_loaded()
+    _last_game_version = game_version
+    version = match_patch(game_version, local_ddragon_versions())
+    if version and (ITEM_PRICES is None or ITEM_PRICES.version != version):
+        ITEM_PRICES = load_item_catalog(version)
+        print(f"📦 [ItemCatalog] Using item data for patch {version}")
+    return ensure_item_prices_loaded()
+
+def _flatten_items(players):
+    owners, item_ids, counts = [], [], []
+    for index, player in enumerate(players):
+        for item in player.get("items", []):
+            item_id = item.get("itemID")
+            if item_id is None:
+                continue
+            owners.append(index)
+            item_ids.append(item_id)
+            counts.append(item.get("count", 1))
+    return owners, item_ids, counts
+
+def estimate_players_item_gold(players, prices=None):
+    """Item gold per player, resolving every item of the roster in one table lookup."""
+    prices = prices or ensure_item_prices_loaded()
+    owners, item_ids, counts = _flatten_items(players)
+    gold = np.zeros(len(players), dtype=np.int64)
+    if item_ids:
+        np.add.at(gold, owners, prices.prices_for(item_ids) * np.asarray(counts, dtype=np.int64))
+    return [int(value) for value in gold]
+
 def estimate_team_gold(players):
-    prices = ensure_item_prices_loaded()
     team_gold = {}
-    for player in players:
+    for player, total in zip(players, estimate_players_item_gold(players)):
         team = player.get("team", "UNKNOWN")
-        items = player.get("items", [])
-        total = 0
-        for item in items:
-            item_id = item.get("itemID")
-            real_price = prices.get(item_id, 0)
-            total += real_price * item.get("count", 1)
         team_gold[team] = team_gold.get(team, 0) + total
     return team_gold
 
 def estimate_player_item_gold(player, prices):
-    total = 0
-    for item in player.get("items", []):
-        item_id = item.get("itemID")
-        total += prices.get(item_id, 0) * item.get("count", 1)
-    return total
+    return estimate_players_item_gold([player], prices)[0]
 
 def infer_missing_roles(formatted_players):
     # Count current roles
@@ -188,3 +190,67 @@ def power_score(player, enemy_laner=None, team_data=None, game_time_minutes=1, v
             print("  ", line)
         print(f"🎯 Total Score: {round(score, 1)}\n")
     return round(score, 1)
+
+def _item_gold_column(players, prices):
+    return np.array(estimate_players_item_gold(players, prices), dtype=np.float64)
+
+def _team_column(team_data_list, key):
+    return np.array([(td or {}).get(key, 0) for td in team_data_list], dtype=np.float64)
+
+def power_scores(players, enemy_laners=None, team_data_list=None, game_time_minutes=1, verbose=False):
+    """
+    Batched power_score() for a whole roster: every component is computed as an array in one pass.
+    Components are accumulated in the same order as power_score() and rounded with Python's round(),
+    so each result is identical to calling power_score() per player. With verbose=True the
+    per-player breakdown is printed (built only then, via power_score itself).
+    """
+    n = len(players)
+    if n == 0:
+        return []
+    enemy_laners = enemy_laners or [None] * n
+    team_data_list = team_data_list or [None] * n
+    if verbose:
+        for player, enemy, td in zip(players, enemy_laners, team_data_list):
+            power_score(player, enemy_laner=enemy, team_data=td, game_time_minutes=game_time_minutes, verbose=True)
+    item_prices = ensure_item_prices_loaded()
+    scores_of = [player["scores"] for player in players]
+    level = np.array([player.get("level", 1) for player in players], dtype=np.float64)
+    enemy_level = np.array([enemy.get("level", 1) if enemy else 0 for enemy in enemy_laners], dtype=np.float64)
+    has_enemy = np.array([bool(enemy) for enemy in enemy_laners])
+    kills = np.array([s.get("kills", 0) for s in scores_of], dtype=np.float64)
+    deaths = np.array([s.get("deaths", 0) for s in scores_of], dtype=np.float64)
+    assists = np.array([s.get("assists", 0) for s in scores_of], dtype=np.float64)
+    creep_score = np.array([s.get("creepScore", 0) for s in scores_of], dtype=np.float64)
+    ward_score = np.array([s.get("wardScore", 0) for s in scores_of], dtype=np.float64)
+    kill_streak = np.array([player.get("killStreak", 0) for player in players], dtype=np.float64)
+    minutes = max(game_time_minutes, 1)
+    # 🧬 Level + 💰 Items
+    score = (level / 18) * 90
+    score = score + np.minimum(_item_gold_column(players, item_prices) / 15000, 1) * 90
+    # 📈 Lane dominance
+    lane_score = np.minimum(np.maximum(level - enemy_level, 0), 3) * 5
+    score = score + np.where(has_enemy, lane_score, 0.0)
+    # 🔥 KDA (Python round, to match power_score exactly) + legendary streak
+    kda_ratio = (kills + assists) / np.maximum(deaths, 1)
+    score = score + np.array([round(float(ratio), 1) for ratio in kda_ratio])
+    score = score + np.where(kill_streak >= 8, 5.0, 0.0)
+    # 💀 Deaths
+    score = score - np.minimum(deaths * 2, 20)
+    # 🐸 CS + 👁️ Vision
+    score = score + np.minimum((creep_score / minutes) / 10, 1) * 3
+    score = score + np.minimum((ward_score / minutes) / 4, 1) * 2
+    # 🏆 Team globals
+    score = score + _team_column(team_data_list, "dragons") * 3
+    score = score + np.where(_team_column(team_data_list, "dragon_soul") != 0, 10.0, 0.0)
+    score = score + np.where(_team_column(team_data_list, "elder_dragon") != 0, 15.0, 0.0)
+    score = score + np.where(_team_column(team_data_list, "baron_buff") != 0, 15.0, 0.0)
+    score = score + _team_column(team_data_list, "heralds") * 5
+    atakan_buff = _team_column(team_data_list, "atakan_buff") != 0
+    score = score + np.where(atakan_buff, 10.0, _team_column(team_data_list, "atakan_temp") * 5)
+    void_grubs = _team_column(team_data_list, "void_grubs")
+    score = score + (void_grubs + np.where(void_grubs >= 3, 5, 0) + np.where(void_grubs == 6, 3, 0))
+    score = score + _team_column(team_data_list, "feats_of_strength") * 5
+    towers = [(td or {}).get("towers", {}) for td in team_data_list]
+    score = score + np.array([t.get("tier1", 0)*2 + t.get("tier2", 0)*3 + t.get("tier3", 0)*4 for t in towers], dtype=np.float64)
+    score = score + _team_column(team_data_list, "inhibitors_down") * 10
+    return [round(float(value), 1) for value in score]
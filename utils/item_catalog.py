@@ -0,0 +1,132 @@
+# utils/item_catalog.py
+import json
+import os
+import numpy as np
+
+DDRAGON_DIR = os.getenv("DDRAGON_DIR", "./ddragon")  # Local Data Dragon snapshots: <dir>/<version>/data/en_US/item.json
+CATALOG_DIR = "./item_catalog"
+LEGACY_PRICE_CACHE = "cached_item_prices.json"
+ITEM_DTYPE = np.dtype([("id", "<i4"), ("price", "<i4"), ("tags", "<u8")])
+
+def _version_key(version):
+    return tuple(int(part) if part.isdigit() else -1 for part in version.split("."))
+
+def local_ddragon_versions(ddragon_dir=DDRAGON_DIR):
+    """Data Dragon versions available on disk, newest first."""
+    if not os.path.isdir(ddragon_dir):
+        return []
+    versions = [
+        name for name in os.listdir(ddragon_dir)
+        if os.path.exists(os.path.join(ddragon_dir, name, "data", "en_US", "item.json"))
+    ]
+    return sorted(versions, key=_version_key, reverse=True)
+
+def match_patch(game_version, versions):
+    """Snapshot for a Live Client gameVersion ("15.7.684.1234" → "15.7.x"), or None."""
+    parts = (game_version or "").split(".")
+    if len(parts) < 2:
+        return None
+    prefix = f"{parts[0]}.{parts[1]}."
+    return next((v for v in versions if v.startswith(prefix)), None)
+
+class ItemCatalog:
+    """
+    Compact id → price/tags table for one patch.
+    Rows are sorted by item id in a structured .npy file that is memory-mapped on load;
+    lookups are np.searchsorted over the id column, so a whole roster's items resolve in one call.
+    Tags are stored as a bitmask over `tag_names`.
+    """
+    def __init__(self, version, table, tag_names):
+        self.version = version
+        self.table = table
+        self.ids = table["id"]
+        self.prices = table["price"]
+        self.tag_names = tag_names
+
+    def __len__(self):
+        return len(self.table)
+
+    def _rows(self, item_ids):
+        item_ids = np.asarray(item_ids, dtype=np.int64)
+        rows = np.searchsorted(self.ids, item_ids)
+        rows = np.minimum(rows, max(len(self.ids) - 1, 0))
+        found = (self.ids[rows] == item_ids) if len(self.ids) else np.zeros(len(item_ids), dtype=bool)
+        return rows, found
+
+    def prices_for(self, item_ids):
+        """Total gold cost per id (0 for unknown ids)."""
+        if not len(self.ids):
+            return np.zeros(len(item_ids), dtype=np.int64)
+        rows, found = self._rows(item_ids)
+        return np.where(found, self.prices[rows], 0).astype(np.int64)
+
+    def get(self, item_id, default=0):
+        """dict.get-style single lookup, so the catalog can stand in for the old price dict."""
+        if item_id is None or not len(self.ids):
+            return default
+        rows, found = self._rows([item_id])
+        return int(self.prices[rows[0]]) if found[0] else default
+
+    def tags_for(self, item_id):
+        rows, found = self._rows([item_id])
+        if not found[0]:
+            return []
+        mask = int(self.table["tags"][rows[0]])
+        return [name for bit, name in enumerate(self.tag_names) if mask >> bit & 1]
+
+def _catalog_paths(version, catalog_dir=CATALOG_DIR):
+    return (os.path.join(catalog_dir, f"items_{version}.npy"),
+            os.path.join(catalog_dir, f"items_{version}.tags.json"))
+
+def build_catalog(version, items, catalog_dir=CATALOG_DIR):
+    """Write the .npy table for `items` ({id: (price, [tags])}) and return its paths."""
+    tag_names = sorted({tag for _, tags in items.values() for tag in tags})[:64]
+    tag_bits = {name: bit for bit, name in enumerate(tag_names)}
+    table = np.zeros(len(items), dtype=ITEM_DTYPE)
+    for row, item_id in enumerate(sorted(items)):
+        price, tags = items[item_id]
+        mask = 0
+        for tag in tags:
+            if tag in tag_bits:
+                mask |= 1 << tag_bits[tag]
+        table[row] = (item_id, price, mask)
+    os.makedirs(catalog_dir, exist_ok=True)
+    table_path, tags_path = _catalog_paths(version, catalog_dir)
+    np.save(table_path, table)
+    with open(tags_path, "w", encoding="utf-8") as f:
+        json.dump(tag_names, f)
+    print(f"📦 [ItemCatalog] Built {version} catalog: {len(table)} items")
+    return table_path, tags_path
+
+def _items_from_ddragon(version, ddragon_dir=DDRAGON_DIR):
+    with open(os.path.join(ddragon_dir, version, "data", "en_US", "item.json"), "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {int(k): (v["gold"]["total"], v.get("tags", [])) for k, v in data["data"].items()}
+
+def _items_from_legacy_cache(path=LEGACY_PRICE_CACHE):
+    with open(path, "r", encoding="utf-8") as f:
+        return {int(k): (v, []) for k, v in json.load(f).items()}
+
+def load_item_catalog(version=None, catalog_dir=CATALOG_DIR, ddragon_dir=DDRAGON_DIR):
+    """
+    Catalog for `version` (default: newest local Data Dragon snapshot).
+    Built once from the snapshot (or seeded from cached_item_prices.json when no snapshot
+    exists) and memory-mapped afterwards. Never touches the network.
+    """
+    versions = local_ddragon_versions(ddragon_dir)
+    version = version or (versions[0] if versions else "cached")
+    table_path, tags_path = _catalog_paths(version, catalog_dir)
+    if not os.path.exists(table_path):
+        if version in versions:
+            items = _items_from_ddragon(version, ddragon_dir)
+        elif os.path.exists(LEGACY_PRICE_CACHE):
+            print(f"⚠️ [ItemCatalog] No local Data Dragon snapshot ({version}) — seeding from {LEGACY_PRICE_CACHE}")
+            items = _items_from_legacy_cache()
+        else:
+            print("⚠️ [ItemCatalog] No item data available; item gold will read as 0")
+            items = {}
+        build_catalog(version, items, catalog_dir)
+    table = np.load(table_path, mmap_mode="r")
+    with open(tags_path, "r", encoding="utf-8") as f:
+        tag_names = json.load(f)
+    return ItemCatalog(version, table, tag_names)
@@ -0,0 +1,65 @@
+# utils/roster.py
+
+ROLE_MAPPING = {
+    "TOP": "top",
+    "JUNGLE": "jungle",
+    "MIDDLE": "middle",
+    "BOTTOM": "bottom",
+    "UTILITY": "utility",
+    "SUPPORT": "utility"
+}
+MINION_TEAM_PREFIXES = {
+    "Minion_T100": "ORDER",
+    "Minion_T200": "CHAOS",
+}
+
+def normalize_role(position):
+    if not position:
+        return "unknown"
+    return ROLE_MAPPING.get(position.upper(), "unknown")
+
+class RosterIndex:
+    """
+    Hash index over one allgamedata `allPlayers` snapshot.
+    Built once per poll by the monitor and shared with every trigger through
+    current_data["roster"], so name → team/role/player lookups are O(1).
+    """
+    def __init__(self, all_players):
+        self.players = all_players
+        self.by_name = {}
+        self.by_role = {}  # raw position → {team: first player of that team}
+        for player in all_players:
+            for key in (player.get("summonerName"), player.get("riotId"), player.get("riotIdGameName")):
+                if key:
+                    self.by_name.setdefault(key, player)
+            self.by_role.setdefault(player.get("position", ""), {}).setdefault(player.get("team"), player)
+
+    def player(self, name):
+        return self.by_name.get(name)
+
+    def team_of(self, name):
+        """Team of a champion by summoner/riot name, or None if it's not a player."""
+        player = self.by_name.get(name)
+        return player.get("team") if player else None
+
+    def role_of(self, name):
+        player = self.by_name.get(name)
+        return normalize_role(player.get("position", "")) if player else "unknown"
+
+    def team_of_killer(self, killer_name):
+        """Like team_of(), but also resolves minion killers (e.g. Minion_T100L...) to a team."""
+        team = self.team_of(killer_name)
+        if team or not killer_name:
+            return team
+        for prefix, minion_team in MINION_TEAM_PREFIXES.items():
+            if killer_name.startswith(prefix):
+                return minion_team
+        return None
+
+    def lane_opponent(self, player):
+        """First enemy player (in allPlayers order) with the same position."""
+        team = player.get("team", "")
+        for other_team, enemy in self.by_role.get(player.get("position", ""), {}).items():
+            if other_team != team:
+                return enemy
+        return None
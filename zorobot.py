@@ -7,11 +7,15 @@ from twitchAPI.oauth import AuthScope
 from twitchAPI.object.eventsub import ChannelRaidEvent
 from collections import defaultdict, Counter
 from twitchio.ext import commands
-import pyttsx3
 from datetime import datetime, timedelta, timezone
 from openai import OpenAI
 import concurrent.futures
 from shutdown_hooks import setup_shutdown_hooks
+from llm_gateway import LLMGateway
+from tts_engine import StreamingTTSEngine
+from tts_utils import offline_speech
+from log_utils import log_line
+from journal import journal
 from obs_controller import OBSController, log_obs_event
 from overlay_ws_server import start_server as start_overlay_ws_server
 from overlay_push import (push_askai_overlay,push_event_overlay,push_commentary_overlay,push_hide_overlay, push_toggle_power_overlay,
@@ -24,14 +28,14 @@ from triggers.game_triggers import (HPDropTrigger, CSMilestoneTrigger, KillCount
              DragonKillTrigger, MultikillEventTrigger, GameEndTrigger, GoldDifferenceTrigger, AceTrigger, BaronTrigger, AtakhanKillTrigger, HeraldKillTrigger,
              FeatsOfStrengthTrigger)
 from elevenlabs.client import ElevenLabs
-from elevenlabs import play, VoiceSettings
+from elevenlabs import VoiceSettings
 import json
 import random
 from utils.game_utils import estimate_team_gold,ensure_item_prices_loaded
 from memory_manager import (add_to_memory,query_memory_relevant,count_user_memories, summarize_and_replace_user_memories_async, get_current_game_id,
-                            query_memory_for_type,add_game_memory)
+                            query_memory_for_type,add_game_memory,generate_embedding,query_memory_for_askai,query_memory_for_game)
 from game_data_monitor import set_callback, game_data_loop, generate_game_recap, get_previous_state, set_triggers, feats_trigger, streak_trigger
-from shared_state import previous_state,inhib_respawn_timer, baron_expire, elder_expire, player_ratings,seen_inhib_events,tracker  
+from shared_state import previous_state, event_store, player_ratings, tracker
 from prompts.user_prompts import get_random_commentary_prompt, get_random_recap_prompt
 
 # === Load Environment Variables ===
@@ -47,7 +51,7 @@ USER_REFRESH_TOKEN = os.getenv("TWITCH_REFRESH_TOKEN")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 eleven = ElevenLabs(api_key=os.getenv("ELEVEN_API_KEY"))
 # === OpenAI Setup ===
-client = OpenAI(api_key=OPENAI_API_KEY)
+llm = LLMGateway(api_key=OPENAI_API_KEY)  # ✅ Async, bounded, with per-call timeouts
 RIOT_API_KEY = os.getenv("RIOT_API_KEY") 
 USE_ELEVENLABS = os.getenv("USE_ELEVENLABS", "true").lower() == "true"
 
@@ -109,9 +113,6 @@ MAX_TTS_QUEUE_SIZE = 12  # Prevents spam/flood
 ASKAI_TTS_RESERVED_LIMIT = 7  # Maximum messages askai is allowed to use in TTS queue
 EVENTSUB_RESERVED_SLOTS = MAX_TTS_QUEUE_SIZE - ASKAI_TTS_RESERVED_LIMIT
 overlay_ws_task = None
-# 💡 Adjustable polling interval (every 8s)
-POLL_INTERVAL = 5
-LIVE_CLIENT_URL = "https://127.0.0.1:2999/liveclientdata/allgamedata"
 # Basic state snapshot for change detection
 triggers = [
     #HPDropTrigger(threshold_percent=35, min_current_hp=70, cooldown=30),
@@ -129,6 +130,9 @@ triggers = [
     BaronTrigger(),
     #MultikillEventTrigger(player_name="Zoro2000"),
 ]
+# ⏱️ LLM call deadlines (seconds)
+AI_RESPONSE_TIMEOUT = 25
+CLASSIFY_TIMEOUT = 8
 # 🔥 TTS cooldown config
 GAME_TTS_COOLDOWN = 5.1  # seconds
 last_game_tts_time = 0  # global timestamp tracker
@@ -185,15 +189,17 @@ def load_system_prompt(mode):
     except FileNotFoundError:
         return "You are a witty League of Legends commentator."
     
-def get_ai_response(prompt, mode, user=None, type_="askai", enable_memory=True):
+async def get_ai_response(prompt, mode, user=None, type_="askai", enable_memory=True, memory_chunks=None):
     system_prompt = load_system_prompt(mode)
-    # 🧠 Retrieve memory context
+    # 🧠 Retrieve memory context (Chroma is blocking → worker thread), unless the caller prefetched it
     try:
-        if type_ in ["game", "recap"]:
+        if memory_chunks is not None:
+            pass
+        elif type_ in ["game", "recap"]:
             game_id = get_current_game_id(tracker.get_stream_date(), tracker.get_game_number())
-            memory_chunks = query_memory_for_type(prompt, type_, user, game_id)
+            memory_chunks = await asyncio.to_thread(query_memory_for_type, prompt, type_, user, game_id)
         else:
-            memory_chunks = query_memory_for_type(prompt, type_, user)
+            memory_chunks = await asyncio.to_thread(query_memory_for_type, prompt, type_, user)
     except Exception as e:
         log_error(f"[Memory Query ERROR] {e}")
         memory_chunks = []
@@ -220,7 +226,8 @@ def get_ai_response(prompt, mode, user=None, type_="askai", enable_memory=True):
             "}\n\n"
             "✅ Only extract and store *useful knowledge*, not a paraphrase of the question.\n"
         )
-    response = client.chat.completions.create(
+    response = await llm.chat(
+        timeout=AI_RESPONSE_TIMEOUT,
         model="gpt-5-2025-08-07",  #gpt-4o, chatgpt-4o-latest, gpt-5-2025-08-07, gpt-4o-2024-11-20, gpt-4.1-2025-04-14, gpt-5-mini-2025-08-07
         messages=[
             {"role": "system", "content": system_prompt},
@@ -240,10 +247,10 @@ def get_ai_response(prompt, mode, user=None, type_="askai", enable_memory=True):
             summary = parsed["summary"]
             stream_date = tracker.get_stream_date()
             game_number = tracker.get_game_number()
-            store_memory_if_valid(summary, type_, user, stream_date, game_number)
+            await asyncio.to_thread(store_memory_if_valid, summary, type_, user, stream_date, game_number)
             if type_ == "askai":
                 try:
-                    if count_user_memories(user, type_="askai") >= 5:
+                    if await asyncio.to_thread(count_user_memories, user, "askai") >= 5:
                         asyncio.create_task(summarize_and_replace_user_memories_async(user))
                 except Exception as e:
                     log_error(f"[Async Memory Summary ERROR] {e}")
@@ -261,6 +268,8 @@ def get_ai_response(prompt, mode, user=None, type_="askai", enable_memory=True):
     cost = estimate_cost(model, prompt_tokens, completion_tokens)
     log_event(f"[OpenAI] Model={model}, Prompt={prompt_tokens}, Completion={completion_tokens}, "
               f"Total={total_tokens}, Cost=${cost:.5f}")
+    journal("openai_usage", game_id=tracker.get_game_id(), user=user, type=type_, model=model,
+            prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, total_tokens=total_tokens, cost=round(cost, 6))
     # ✅ Schedule overlay update (cost only)
     try:
         asyncio.create_task(push_cost_increment(cost))  # We’ll define this
@@ -280,6 +289,30 @@ def get_ai_response(prompt, mode, user=None, type_="askai", enable_memory=True):
     return ai_text
     #return response.choices[0].message.content
 
+async def prepare_askai_request(user, question):
+    """
+    Classify the question and fetch its memory context concurrently.
+    The prompt is embedded once and the same vector feeds both the AskAI and
+    the (speculative) current-game memory search; the classification picks which one is used.
+    """
+    classify_task = asyncio.create_task(classify_prompt_type(question))
+    try:
+        embedding = await asyncio.to_thread(generate_embedding, question)
+        game_id = None
+        if tracker.get_game_number() > 0:
+            game_id = get_current_game_id(tracker.get_stream_date(), tracker.get_game_number())
+        searches = [asyncio.to_thread(query_memory_for_askai, question, user, embedding=embedding)]
+        if game_id:
+            searches.append(asyncio.to_thread(query_memory_for_game, question, game_id, embedding=embedding))
+        askai_chunks, *game_chunks = await asyncio.gather(*searches)
+    except Exception as e:
+        log_error(f"[AskAI Memory Prefetch ERROR] {e!r}")
+        askai_chunks, game_chunks = [], []
+    detected_type = await classify_task
+    if detected_type == "game":
+        return detected_type, (game_chunks[0] if game_chunks else [])
+    return detected_type, askai_chunks
+
 def build_game_prompt(memory_text: str, user_prompt: str) -> str:
     # 🧠 Explain how to read the memory data
     guide = (
@@ -309,21 +342,26 @@ def build_game_prompt(memory_text: str, user_prompt: str) -> str:
     )
     return enhanced_prompt
 
-def classify_prompt_type(prompt):
-    response = client.chat.completions.create(
-        model="gpt-4.1-mini-2025-04-14",  # Cheaper model for classification
-        messages=[
-            {"role": "system", "content": (
-                "You are a simple classifier. Decide whether the user's message "
-                "is about the current League of Legends game or not. "
-                "Respond only with 'game' if the user is asking something about the current League of Legends match, strategy, gameplay, or events. "
-                "If it’s a general question, lore, or not related to gameplay, respond 'askai'."
-            )},
-            {"role": "user", "content": prompt}
-        ],
-        max_tokens=5,
-        temperature=0.0
-    )
+async def classify_prompt_type(prompt):
+    try:
+        response = await llm.chat(
+            timeout=CLASSIFY_TIMEOUT,
+            model="gpt-4.1-mini-2025-04-14",  # Cheaper model for classification
+            messages=[
+                {"role": "system", "content": (
+                    "You are a simple classifier. Decide whether the user's message "
+                    "is about the current League of Legends game or not. "
+                    "Respond only with 'game' if the user is asking something about the current League of Legends match, strategy, gameplay, or events. "
+                    "If it’s a general question, lore, or not related to gameplay, respond 'askai'."
+                )},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=5,
+            temperature=0.0
+        )
+    except Exception as e:
+        log_error(f"[Prompt Type Classifier ERROR] {e!r}")
+        return "askai"
     try:
         content = response.choices[0].message.content.strip().lower()
         if content.startswith("game"):
@@ -372,7 +410,7 @@ def estimate_cost(model, prompt_tokens, completion_tokens):
         return (prompt_tokens / 1000000 * 1.25) + (completion_tokens / 1000000 * 10)
     return 0.0
 
-def get_event_reaction(event_type, user):
+async def get_event_reaction(event_type, user):
     base_prompt = {
         "sub": f"{user} just subscribed! React with high-energy shoutcaster hype.",
         "resub": f"{user} resubbed! Hype it up like a dramatic League of Legends caster.",
@@ -381,32 +419,40 @@ def get_event_reaction(event_type, user):
         "gift": f"{user} gifted a sub! React like it’s a game-winning teamfight.",
         "giftmass": f"{user} just launched a gift sub train! React like the Nexus is exploding!",
     }.get(event_type, f"{user} triggered an unknown event. React accordingly.")
-    return get_ai_response(prompt=base_prompt, mode=get_current_mode(), user=user, type_="event", enable_memory=False)
+    return await get_ai_response(prompt=base_prompt, mode=get_current_mode(), user=user, type_="event", enable_memory=False)
+
+def speak_offline(text):
+    # ElevenLabs disabled OR it failed before producing any audio → shared long-lived pyttsx3 engine
+    offline_speech.speak(text)
+
+tts_engine = StreamingTTSEngine(
+    client=eleven,
+    model=ELEVEN_MODEL,
+    voice_settings=VoiceSettings(stability=0.5, similarity_boost=0.8, speed=1.05),
+    fallback=speak_offline,
+    enabled=USE_ELEVENLABS
+)
+
+def prepare_speech(text):
+    """Start synthesizing `text` now (in the current mode's voice); play it later with speak_prepared()."""
+    voice_id = VOICE_BY_MODE.get(get_current_mode(), ELEVEN_VOICE_ID)
+    return tts_engine.prepare(text, voice_id)
+
+async def speak_prepared(utterance):
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(tts_executor, tts_engine.play, utterance)
 
 def speak_sync(text, voice_id=ELEVEN_VOICE_ID):
-    if USE_ELEVENLABS:
-        try:
-            audio = eleven.generate(
-                text=text,
-                voice=voice_id,
-                model=ELEVEN_MODEL,
-                voice_settings=VoiceSettings(stability=0.5, similarity_boost=0.8, speed=1.05)
-            )
-            play(audio)
-            return
-        except Exception as e:
-            log_error(f"[TTS FALLBACK] ElevenLabs failed, falling back to pyttsx3. Reason: {e}")
-    # Either flag is false OR ElevenLabs failed
-    engine = pyttsx3.init()
-    engine.setProperty('rate', 160)
-    engine.say(text)
-    engine.runAndWait()
+    tts_engine.play(tts_engine.prepare(text, voice_id))
 
 async def speak_text(text):
-    loop = asyncio.get_running_loop()
-    mode = get_current_mode()
-    voice_id = VOICE_BY_MODE.get(mode, ELEVEN_VOICE_ID)
-    await loop.run_in_executor(tts_executor, speak_sync, text, voice_id)
+    await speak_prepared(prepare_speech(text))
+
+def tts_item_text(item):
+    """The line a TTS queue item will speak."""
+    if isinstance(item, tuple) and item[0] in ("askai", "event", "game"):
+        return item[-1]
+    return item
 
 def push_overlay_later(func, *args, delay=0.1):
     async def _task():
@@ -415,15 +461,36 @@ def push_overlay_later(func, *args, delay=0.1):
         await func(*args)
     asyncio.create_task(_task())
 
+prepared_speech = {}  # text -> utterance already synthesizing for a line still waiting in tts_queue
+
+def prefetch_next_speech():
+    """Start synthesizing the line at the head of tts_queue. It stays queued, so priorities and qsize() are unaffected."""
+    if tts_queue.empty():
+        return
+    _, next_item = tts_queue._queue[0]  # PriorityQueue heap: index 0 is what the next get() returns
+    next_text = tts_item_text(next_item)
+    if next_text not in prepared_speech:
+        prepared_speech[next_text] = prepare_speech(next_text)
+        log_merged_prompt(f"⏩ Prefetching TTS for next item: {next_item[0]}")
+
 async def tts_worker():
     global tts_busy
     while True:
         log_merged_prompt(f"⏳ Waiting on tts_queue.get() at {time.time():.3f}")
         _, item = await tts_queue.get()
+        text = tts_item_text(item)
+        utterance = prepared_speech.pop(text, None) or prepare_speech(text)
         log_merged_prompt(f"✅ Got item from tts_queue at {time.time():.3f}: {item[0]}")
+
+        async def speak_current():
+            prefetch_next_speech()
+            await speak_prepared(utterance)
+
         try:
             tts_busy = True
             log_merged_prompt("🟠 TTS state changed: BUSY")
+            journal("tts_state", state="busy", item_type=item[0] if isinstance(item, tuple) else "system",
+                    text=tts_item_text(item), queue_size=tts_queue.qsize())
             if isinstance(item, tuple) and item[0] in ("askai", "event", "game"):
                 item_type = item[0]
                 if item_type == "askai":
@@ -437,7 +504,7 @@ async def tts_worker():
                     # ✅ Delegate everything to the unified overlay method
                     if hasattr(bot_instance, "obs_controller"):
                         try:
-                            bot_instance.obs_controller.update_ai_overlay(question, answer)
+                            bot_instance.loop.create_task(bot_instance.obs_controller.update_ai_overlay_async(question, answer))
                             bot_instance.loop.create_task(bot_instance.auto_hide_askai_overlay())
                         except Exception as e:
                             log_error(f"[OBS AskAI Update Error] {e}")
@@ -446,7 +513,7 @@ async def tts_worker():
                         push_overlay_later(push_askai_overlay, question, answer, delay=0)
                     except Exception as e:
                         log_error(f"[Overlay Push AskAI ERROR] {e}")
-                    await speak_text(answer)
+                    await speak_current()
                     # NEW: Send hide event to WebSocket
                     try:
                         await push_hide_overlay("askai")
@@ -462,7 +529,7 @@ async def tts_worker():
                         asyncio.create_task(delayed_chat())
                     if hasattr(bot_instance, "obs_controller"):
                         try:
-                            bot_instance.obs_controller.update_event_overlay(text)
+                            bot_instance.loop.create_task(bot_instance.obs_controller.update_event_overlay_async(text))
                             bot_instance.loop.create_task(bot_instance.auto_hide_event_overlay())
                         except Exception as e:
                             log_error(f"[OBS Event Overlay Update Error] {e}")
@@ -471,7 +538,7 @@ async def tts_worker():
                         push_overlay_later(push_event_overlay, text, delay=0)
                     except Exception as e:
                         log_error(f"[Overlay Push Event ERROR] {e}")
-                    await speak_text(text)
+                    await speak_current()
                     try:
                         await push_hide_overlay("event")
                     except Exception as e:
@@ -489,7 +556,7 @@ async def tts_worker():
                     except Exception as e:
                         log_error(f"[Overlay Push Game ERROR] {e}")
                     log_merged_prompt(f"🎤 Begin TTS for: {item[0]} at {time.time():.3f}")
-                    await speak_text(text)
+                    await speak_current()
                     log_merged_prompt(f"✅ Finished TTS for: {item[0]} at {time.time():.3f}")
                     try:
                         await push_hide_overlay("commentary")
@@ -497,13 +564,14 @@ async def tts_worker():
                         log_error(f"[Overlay Commentary Hide ERROR] {e}")
             else:
                 # Plain system message
-                await speak_text(item)
+                await speak_current()
         except Exception as e:
             log_error(f"TTS ERROR: {e}")
         finally:
             tts_queue.task_done()
             tts_busy = False
             log_merged_prompt(f"🟢 TTS state changed: IDLE | Queue size: {tts_queue.qsize()}")
+            journal("tts_state", state="idle", queue_size=tts_queue.qsize())
             await asyncio.sleep(0.5)  # ⏱️ Small delay to avoid spammy speech
 
 async def safe_add_to_tts_queue(item):
@@ -540,58 +608,32 @@ async def tts_monitor_loop():
             # 📄 For logs
             debug_prompt = f"{personality_prompt}\n{numbered_debug}"
             log_merged_prompt(debug_prompt)
-            ai_text = get_ai_response(prompt=combined_prompt, mode=mode, user="GameMonitor", type_="game")
+            buffered_game_events.clear()
+            try:
+                ai_text = await get_ai_response(prompt=combined_prompt, mode=mode, user="GameMonitor", type_="game")
+            except Exception as e:
+                log_error(f"[Game Commentary AI ERROR] {e!r}")
+                continue
             # 🔁 Second log (post-AI)
             log_merged_prompt(f"🗣️ AI said:\n{ai_text}")
             await safe_add_to_tts_queue(("game", "GameMonitor", ai_text))
-            buffered_game_events.clear()
 
-def _get_log_path(log_filename: str) -> str:
-    date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    log_dir = os.path.join("logs", date_str)
-    os.makedirs(log_dir, exist_ok=True)
-    return os.path.join(log_dir, log_filename)
 def log_error(error_text: str):
-    timestamp = datetime.now(timezone.utc).isoformat()
-    path = _get_log_path("errors.log")
-    with open(path, "a", encoding="utf-8") as error_file:
-        error_file.write(f"[{timestamp}] {error_text}\n")
+    log_line("errors.log", error_text)
 def log_event(text: str):
-    timestamp = datetime.now(timezone.utc).isoformat()
-    path = _get_log_path("openai_usage.log")
-    with open(path, "a", encoding="utf-8") as log_file:
-        log_file.write(f"[{timestamp}] {text}\n")
+    log_line("openai_usage.log", text)
 def log_merged_prompt(text: str):
-    timestamp = datetime.now(timezone.utc).isoformat()
-    path = _get_log_path("merged_prompts.log")
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(f"[{timestamp}] {text.strip()}\n")
+    log_line("merged_prompts.log", text.strip())
 def log_recap_prompt(text: str):
-    timestamp = datetime.now(timezone.utc).isoformat()
-    path = _get_log_path("recaps.log")
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(f"[{timestamp}] {text.strip()}\n")
+    log_line("recaps.log", text.strip())
 def log_askai_commentary_prompt(text: str):
-    timestamp = datetime.now(timezone.utc).isoformat()
-    path = _get_log_path("askai_commentary.log")
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(f"[{timestamp}] {text.strip()}\n")
+    log_line("askai_commentary.log", text.strip())
 def log_askai_question(user: str, question: str, answer: str):
-    timestamp = datetime.now(timezone.utc).isoformat()
-    path = _get_log_path("askai.log")
-    log_entry = f"[{timestamp}] {user}: Q: {question} | A: {answer.strip()}\n"
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(log_entry)
+    log_line("askai.log", f"{user}: Q: {question} | A: {answer.strip()}")
 def log_ai_response(text):
-    path = _get_log_path("askai_full.log")
-    timestamp = datetime.now(timezone.utc).isoformat()
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(f"[{timestamp}] {text}\n\n")
+    log_line("askai_full.log", f"{text}\n")
 def log_event2(message: str):
-    timestamp = datetime.now(timezone.utc).isoformat()
-    path = _get_log_path("events.log")
-    with open(path, "a", encoding="utf-8") as log_file:
-        log_file.write(f"[{timestamp}] {message}\n")
+    log_line("events.log", message)
 
 
 def is_game_related(question: str):
@@ -605,12 +647,8 @@ async def clear_state_after_delay(delay_seconds=6):
     game_ended = previous_state.get("game_ended", False)
     print("[Before Clear] previous_state =", previous_state)  # 🔍 Add this line for sanity check
     previous_state.clear()
-    # Also clear buff/inhib timers
-    inhib_respawn_timer["ORDER"].clear()
-    inhib_respawn_timer["CHAOS"].clear()
-    baron_expire.clear()
-    elder_expire.clear()
-    seen_inhib_events.clear()
+    # Also clear buff/inhib timers and the event index
+    event_store.reset()
     player_ratings.clear()
     # 🧽 Push cleared overlay state
     await push_power_scores({    # ✅ This clears the panel visually
@@ -659,18 +697,22 @@ def handle_game_data(data, your_player_data, current_data, merged_results):
         if game_time_seconds < 300:
             print("⏳ Skipping early-game recap.")
             return
-        last_snapshot = previous_state.get("last_recap_snapshot") or previous_state.copy()
+        last_snapshot = previous_state.get("last_recap_snapshot") or previous_state.get("snapshot")
         recap_text = generate_game_recap(data, your_player_data, data.get("activePlayer", {}), last_snapshot, current_data["dragon_kills"])
         if recap_text:
             recap_prompt = get_random_recap_prompt() + "\n" + recap_text
             log_recap_prompt(recap_prompt)  # 🧼 New log file!
-            ai_text = get_ai_response(prompt=recap_prompt, mode=mode, user="RecapEngine", type_="recap", enable_memory=True)
-            asyncio.create_task(safe_add_to_tts_queue(("game", "GameRecap", ai_text)))
+            asyncio.create_task(speak_recap(recap_prompt, mode))  # ✅ Don't hold the game loop during the LLM call
             previous_state["last_recap_time"] = timestamp_now
-            previous_state["last_recap_snapshot"] = {
-                **current_data,
-                "items": your_player_data.get("items", [])
-            }
+            previous_state["last_recap_snapshot"] = current_data  # Immutable GameSnapshot (already carries your items)
+
+async def speak_recap(recap_prompt, mode):
+    try:
+        ai_text = await get_ai_response(prompt=recap_prompt, mode=mode, user="RecapEngine", type_="recap", enable_memory=True)
+    except Exception as e:
+        log_error(f"[Recap AI ERROR] {e!r}")
+        return
+    await safe_add_to_tts_queue(("game", "GameRecap", ai_text))
 
 # === AI Commentator Mode ===
 async def start_commentator_mode(interval_sec=60):
@@ -686,7 +728,7 @@ async def start_commentator_mode(interval_sec=60):
             previous_mode = mode
         prompt = "Comment on the current state of the game with your personality."
         try:
-            ai_text = get_ai_response(prompt, mode, user="Commentator", type_="commentate")
+            ai_text = await get_ai_response(prompt, mode, user="Commentator", type_="commentate")
             print(f"[ZoroTheCaster - {mode.upper()}]:", ai_text)
             await safe_add_to_tts_queue(ai_text)
         except Exception as e:
@@ -773,18 +815,18 @@ class ZoroTheCasterBot(commands.Bot):
     async def auto_hide_event_overlay(self, delay=6):
         await asyncio.sleep(delay)
         if hasattr(self, "obs_controller"):
-            self.obs_controller.set_text("Event_Display", "")
+            await self.obs_controller.set_text_async("Event_Display", "")
 
     async def on_subscribe_event(self, event):
         if eventsub_paused:
             return
         user = event['user_name']
         print(f"[SUB EVENT] {user} just subscribed!")
-        ai_text = get_event_reaction("sub", user)
+        ai_text = await get_event_reaction("sub", user)
         await safe_add_to_tts_queue(("event", user, ai_text))
         await self.send_to_chat(f"🎉 {user} just subscribed! 💬 ZoroTheCaster is reacting...")
         if hasattr(self, "obs_controller"):
-            self.obs_controller.update_event_overlay(f"🎉 {user} just subscribed!")
+            await self.obs_controller.update_event_overlay_async(f"🎉 {user} just subscribed!")
             self.loop.create_task(self.auto_hide_event_overlay())
 
     async def on_cheer_event(self, event):
@@ -793,11 +835,11 @@ class ZoroTheCasterBot(commands.Bot):
         user = event['user_name']
         bits = event['bits']
         print(f"[CHEER EVENT] {user} sent {bits} bits!")
-        ai_text = get_event_reaction("cheer", user)
+        ai_text = await get_event_reaction("cheer", user)
         await safe_add_to_tts_queue(("event", user, ai_text))
         await self.send_to_chat(f"💎 {user} just cheered {bits} bits! 💬 ZoroTheCaster is reacting...")
         if hasattr(self, "obs_controller"):
-            self.obs_controller.update_event_overlay(f"💎 {user} cheered {bits} bits!")
+            await self.obs_controller.update_event_overlay_async(f"💎 {user} cheered {bits} bits!")
             self.loop.create_task(self.auto_hide_event_overlay())
 
     async def on_raid_event(self, event: ChannelRaidEvent):
@@ -807,11 +849,11 @@ class ZoroTheCasterBot(commands.Bot):
             user = event.from_broadcaster_user_name
             viewers = event.viewers
             print(f"[RAID EVENT] {user} raided with {viewers} viewers!")
-            ai_text = get_event_reaction("raid", user)
+            ai_text = await get_event_reaction("raid", user)
             await safe_add_to_tts_queue(("event", user, ai_text))
             await self.send_to_chat(f"⚔️ {user} just raided with {viewers} viewers! 💬 ZoroTheCaster is reacting...")
             if hasattr(self, "obs_controller"):
-                self.obs_controller.update_event_overlay(f"⚔️ {user} raided with {viewers} viewers!")
+                await self.obs_controller.update_event_overlay_async(f"⚔️ {user} raided with {viewers} viewers!")
                 self.loop.create_task(self.auto_hide_event_overlay())
         except Exception as e:
             print("❌ Failed to process raid event:", e)
@@ -823,11 +865,11 @@ class ZoroTheCasterBot(commands.Bot):
         user = event['user_name']
         total = event['total']
         print(f"[GIFT EVENT] {user} gifted {total} sub(s)!")
-        ai_text = get_event_reaction("gift", user)
+        ai_text = await get_event_reaction("gift", user)
         await safe_add_to_tts_queue(("event", user, ai_text))
         await self.send_to_chat(f"🎁 {user} just gifted {total} sub(s)! 💬 ZoroTheCaster is reacting...")
         if hasattr(self, "obs_controller"):
-            self.obs_controller.update_event_overlay(f"🎁 {user} gifted {total} sub(s)!")
+            await self.obs_controller.update_event_overlay_async(f"🎁 {user} gifted {total} sub(s)!")
             self.loop.create_task(self.auto_hide_event_overlay())
 
     async def event_message(self, message):
@@ -840,7 +882,7 @@ class ZoroTheCasterBot(commands.Bot):
     async def auto_hide_askai_overlay(self, delay=10):
         await asyncio.sleep(delay)
         if hasattr(self, "obs_controller"):
-            self.obs_controller.set_text("AskAI_Display", "")
+            await self.obs_controller.set_text_async("AskAI_Display", "")
 
     @commands.command(name="vote")
     async def vote(self, ctx):
@@ -1110,11 +1152,14 @@ class ZoroTheCasterBot(commands.Bot):
             mode = get_current_mode()
             try:
                 # 🧠 Classify if it's game-related
-                detected_type = classify_prompt_type(question)
-                ai_text = get_ai_response(prompt=question, mode=mode, user=user,type_=detected_type)
+                # 🧠 Classify + memory retrieval run concurrently
+                detected_type, memory_chunks = await prepare_askai_request(user, question)
+                ai_text = await get_ai_response(prompt=question, mode=mode, user=user, type_=detected_type, memory_chunks=memory_chunks)
                 print(f"[ZoroTheCaster AI Answer - {mode.upper()} / {detected_type}]:", ai_text)
                 await safe_add_to_tts_queue(("askai", user, question, ai_text))
                 log_askai_question(user, raw_question, ai_text)
+                journal("askai", game_id=tracker.get_game_id(), user=user, mode=mode, type=detected_type,
+                        question=raw_question, answer=ai_text)
             except Exception as e:
                 error_msg = f"Error in askai processing for {user}: {e}"
                 print(f"❌ {error_msg}")
@@ -1141,15 +1186,16 @@ class ZoroTheCasterBot(commands.Bot):
 
     def build_game_context(self, state):
         print("[ASKAI] current state for commentary:", state)
-        if not state or "kills" not in state or state.get("game_ended"):
+        snapshot = state.get("snapshot") if state else None  # Latest GameSnapshot from the game monitor
+        if snapshot is None or "kills" not in snapshot or state.get("game_ended"):
             return "🕹️ No game in progress. Ask again once the battle begins!"
-        k = state.get("kills", 0)
-        d = state.get("deaths", 0)
-        a = state.get("assists", 0)
-        cs = state.get("cs", 0)
-        gold = state.get("gold", 0)
-        team = state.get("your_team", "UNKNOWN")
-        dragons = state.get("dragon_kills", {}).get(team, 0)
+        k = snapshot.get("kills", 0)
+        d = snapshot.get("deaths", 0)
+        a = snapshot.get("assists", 0)
+        cs = snapshot.get("cs", 0)
+        gold = snapshot.get("gold", 0)
+        team = snapshot.get("your_team", "UNKNOWN")
+        dragons = (snapshot.get("dragon_kills") or {}).get(team, 0)
         return (
             f"Current in-game stats:\n"
             f"K/D/A: {k}/{d}/{a}, CS: {cs}, Gold: {gold}\n"